@@ -1,11 +1,32 @@
+import threading
+from typing import TYPE_CHECKING
+
 from textual.app import App
 from .screens.home import IbukiHome
-from .backend.backend_v3 import AnimeBackend
+
+if TYPE_CHECKING:
+    from .backend.backend_v3 import AnimeBackend
 
 class Ibuki(App):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._backend = None
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend(self) -> "AnimeBackend":
+        """
+        Shared by every screen, built on first use.
+        Home warms it up in a thread, so the lock keeps it to one instance.
+        """
+        with self._backend_lock:
+            if self._backend is None:
+                from .backend.backend_v3 import AnimeBackend
+                self._backend = AnimeBackend()
+            return self._backend
+
     def on_mount(self):
-        backend = AnimeBackend()
-        self.push_screen(IbukiHome(backend))
+        self.push_screen(IbukiHome())
 
 app = Ibuki()
 
@@ -1,41 +1,186 @@
+import time
+import asyncio
+import dataclasses
+import threading
 from typing import Optional, List
 from pathlib import Path
+from functools import cached_property
 
-from .utils_v3 import WatchHistory
+from .utils_v3 import clean_html, WatchHistory, SQLiteWatchHistory, load_watch_history
 from .settings_control import AnimeSettings
 from .mpv_control import MPVControl
-from ..logs.logger import get_logger
+from .mpv_async import AsyncMPVControl
+from .cache_control import SearchCache, StreamCache, EpisodeCache, AnimeIndex, InfoCache
+from .provider_control import ProviderAdapter
+from .metrics_control import metrics, timed
+from .title_control import TitleIndex, normalize_title, title_similarity
+from ..logs.logger import get_logger, set_log_level
 
 from anipy_api.anime import Anime
-from anipy_api.provider import ProviderStream, LanguageTypeEnum
+from anipy_api.provider import ProviderInfoResult, ProviderStream, ProviderSearchResult, LanguageTypeEnum, get_provider
 from anipy_api.provider.providers.allanime_provider import AllAnimeProvider
 
 # Animebackend v3
 
 class AnimeBackend:
+    """
+    One per app, shared by every screen.
+    The provider, player, history and search cache are only built
+    the first time something touches them.
+    """
+
+    # setting key -> attribute mirroring it
+    SETTING_ATTRS = {
+        "quality": "global_quality",
+        "auto_resume": "auto_resume",
+        "fullscreen": "fullscreen",
+        "skip_intro_seconds": "skip_intro_seconds",
+        "skip_outro_seconds": "skip_outro_seconds",
+        "auto_next_episode": "auto_next_episode",
+        "save_progress_interval": "save_progress_interval",
+        "minimal_progress_threshold": "minimal_progress_threshold",
+        "history_limit": "history_limit",
+        "prefetch_next_at": "prefetch_next_at",
+    }
+
     def __init__(self, settings: AnimeSettings = None):
         self.logger = get_logger("AnimeBackend")
-        self.provider = AllAnimeProvider()
         self.cache = {}
         self.episodes_cache = {}
-        self.watch_history = WatchHistory()
-        self.player = MPVControl()
         self.current_anime = None
         self.current_episode = None
+        self.current_url = None
+        self._play_task = None
+        self._prefetching = set()
+        self._prefetch_lock = threading.Lock()
 
         self.settings = settings or AnimeSettings(config_path=Path.home() / "Project-Ibuki" / "config" / "settings.yaml")
         s = self.settings
-        self.global_quality = s.get("quality")
-        self.auto_resume = s.get("auto_resume")
-        self.fullscreen = s.get("fullscreen")
-        self.skip_intro_seconds = s.get("skip_intro_seconds")
-        self.skip_outro_seconds = s.get("skip_outro_seconds")
-        self.auto_next_episode = s.get("auto_next_episode")
-        self.save_progress_interval = s.get("save_progress_interval")
-        self.minimal_progress_threshold = s.get("minimal_progress_threshold")
-        self.history_limit = s.get("history_limit")
-
-        self.logger.debug(f"AnimeBackend ready with settings: {s.get_all()}")
+        self._apply_settings(s.get_all())
+        s.subscribe(self._apply_settings)
+
+        self.logger.debug("AnimeBackend ready with settings:\n%s", s.get_all())
+
+    def _apply_settings(self, changes: dict):
+        """Settings subscriber, keeps the mirrored attributes and log level current."""
+        for key, attr in self.SETTING_ATTRS.items():
+            if key in changes:
+                setattr(self, attr, changes[key])
+
+        if "log_level" in changes:
+            set_log_level(changes["log_level"])
+
+    @cached_property
+    def provider(self) -> ProviderAdapter:
+        return self._adapt(AllAnimeProvider())
+
+    def _adapt(self, provider) -> ProviderAdapter:
+        return ProviderAdapter(
+            provider,
+            max_retries=self.settings.get("provider_max_retries"),
+            max_in_flight=self.settings.get("provider_max_in_flight"),
+            hedge=self.settings.get("hedge_stream_requests")
+        )
+
+    @cached_property
+    def watch_history(self) -> WatchHistory | SQLiteWatchHistory:
+        return load_watch_history(self.settings.get("history_engine"))
+
+    @cached_property
+    def player(self) -> MPVControl | AsyncMPVControl:
+        if self.settings.get("player_engine") == "async":
+            return AsyncMPVControl()
+        return MPVControl(persistent=self.settings.get("persistent_player"))
+
+    @cached_property
+    def anime_index(self) -> AnimeIndex:
+        return AnimeIndex()
+
+    @cached_property
+    def episode_cache(self) -> EpisodeCache:
+        return EpisodeCache(fresh_for=self.settings.get("episode_cache_fresh_for"))
+
+    @cached_property
+    def stream_cache(self) -> StreamCache:
+        return StreamCache(default_ttl=self.settings.get("stream_cache_ttl"))
+
+    @cached_property
+    def info_cache(self) -> InfoCache:
+        return InfoCache(ttl=self.settings.get("info_cache_ttl"))
+
+    @cached_property
+    def search_cache(self) -> SearchCache:
+        s = self.settings
+        return SearchCache(
+            ttl=s.get("search_cache_ttl"),
+            empty_ttl=s.get("search_cache_empty_ttl"),
+            max_bytes=s.get("search_cache_max_bytes")
+        )
+
+    @cached_property
+    def title_index(self) -> TitleIndex:
+        """
+        Fuzzy index over every show we have seen, from the anime index and
+        watch history. Built once, then kept current by new search results.
+        """
+        index = TitleIndex()
+        index.add_many((entry["identifier"], entry["name"]) for entry in self.anime_index.entries())
+        index.add_many(
+            (anime_id, entry["anime_name"]) for anime_id, entry in self.watch_history.history.items()
+            if anime_id not in index
+        )
+        return index
+
+    def _remember_titles(self, anime_list):
+        if "title_index" in vars(self):
+            self.title_index.add_many((anime.identifier, anime.name) for anime in anime_list)
+
+    def search_local(self, query: str, limit: int = 10) -> List[Anime]:
+        """
+        Shows we already know whose title matches query without touching the
+        provider: titles containing every (partial) word first, then close
+        fuzzy matches so typos still find something.
+        """
+        keys = [key for key, _ in self.title_index.match(query, limit=limit * 2)]
+        keys += [
+            key for key, _, _ in self.title_index.search(query, limit=limit * 2, min_score=0.75)
+            if key not in keys
+        ]
+
+        anime_list = []
+        for identifier in keys:
+            anime = self.get_anime_by_id(identifier)
+            if anime is not None:
+                anime_list.append(anime)
+            if len(anime_list) >= limit:
+                break
+        return anime_list
+
+    def suggest_titles(self, query: str, limit: int = 3) -> List[str]:
+        """
+        "Did you mean" candidates for a query that found nothing.
+        """
+        normalized = normalize_title(query)
+        return [
+            title for _, title, _ in self.title_index.search(query, limit=limit + 1)
+            if normalize_title(title) != normalized
+        ][:limit]
+
+    def find_anime_by_name(self, name: str, identifier: str = None) -> Optional[Anime]:
+        """
+        Rebuild an Anime by searching for its title, picking the result with
+        this identifier if there is one, else the closest title, never just the first hit.
+        """
+        results = self.get_anime_by_query(name)
+        for anime in results:
+            if identifier and anime.identifier == identifier:
+                return anime
+
+        scored = [(title_similarity(name, anime.name), anime) for anime in results]
+        scored = [match for match in scored if match[0] >= 0.6]
+        if not scored:
+            return None
+        return max(scored, key=lambda match: (match[0], -len(match[1].name)))[1]
 
     @staticmethod
     def get_referrer_for_url(url: str) -> str:
@@ -51,12 +196,29 @@ class AnimeBackend:
         else:
             return "https://allanime.day"
 
+    @timed("backend.get_anime_by_query")
     def get_anime_by_query(self, query):
         """
         Search for anime by query string.
         Returns a list of Anime objects.
-        Caches results to avoid redundant searches.
+        Results are cached on disk by normalized query, so repeat
+        searches never touch the provider until the entry expires.
         """
+        cached = self.search_cache.get(query)
+        if cached is not None:
+            metrics.incr("search_cache.hit")
+            self.logger.info(f"Search cache hit for: {query} :3")
+            results = [
+                ProviderSearchResult(
+                    identifier=r["identifier"],
+                    name=r["name"],
+                    languages={LanguageTypeEnum(lang) for lang in r["languages"]}
+                )
+                for r in cached
+            ]
+            return self._to_anime_list(results)
+
+        metrics.incr("search_cache.miss")
         self.logger.info(f"Searching for: {query} :]")
         try:
             results = self.provider.get_search(query)
@@ -65,13 +227,28 @@ class AnimeBackend:
             self.logger.exception(f"Error during search: {str(e)} :/")
             return []
 
+        self.search_cache.set(query, [
+            {
+                "identifier": r.identifier,
+                "name": r.name,
+                "languages": sorted(lang.value for lang in r.languages),
+            }
+            for r in results or []
+        ])
+
         if not results:
             self.logger.warning("No results found :(")
             return []
 
+        return self._to_anime_list(results)
+
+    def _to_anime_list(self, results) -> List[Anime]:
+        """
+        Turn search results into Anime objects, reusing ones we already built.
+        """
         anime_list = []
         for i, r in enumerate(results):
-            key = getattr(r, "id", i)
+            key = getattr(r, "identifier", i)
             if key in self.cache:
                 anime = self.cache[key]
 
@@ -80,54 +257,177 @@ class AnimeBackend:
                 self.cache[key] = anime
             anime_list.append(anime)
 
+        try:
+            self.anime_index.add_many(anime_list)
+        except Exception as e:
+            self.logger.debug(f"Failed to index search results: {e} :/")
+        self._remember_titles(anime_list)
+
         return anime_list
 
-    def get_episode_stream(self, anime, episode, quality) -> Optional[ProviderStream]:
+    def get_anime_by_id(self, anime_id) -> Optional[Anime]:
+        """
+        Rebuild an Anime from its provider identifier without searching.
+        Looks in the in-memory cache first, then the on-disk anime index.
+        """
+        if anime_id in self.cache:
+            return self.cache[anime_id]
+
+        entry = self.anime_index.get(anime_id)
+        if not entry:
+            return None
+
+        provider = self.provider
+        if entry["provider"] and entry["provider"] != getattr(provider, "NAME", None):
+            provider = get_provider(entry["provider"])
+            if provider is None:
+                self.logger.warning(f"Provider {entry['provider']} is not available :/")
+                return None
+            provider = self._adapt(provider)
+
+        anime = Anime(
+            provider,
+            entry["name"],
+            entry["identifier"],
+            {LanguageTypeEnum(lang) for lang in entry["languages"]}
+        )
+        self.cache[anime_id] = anime
+        return anime
+
+    @timed("backend.get_episode_stream")
+    def get_episode_stream(self, anime, episode, quality, lang=LanguageTypeEnum.SUB) -> Optional[ProviderStream]:
         """
         Return a single ProviderStream (best matching quality) or None.
-        Accepts provider returning either a single ProviderStream or a list.
+        Resolved streams are cached by (identifier, episode, quality, language)
+        until shortly before their signed url expires.
         """
+        key = (getattr(anime, "identifier", str(id(anime))), episode, quality, lang.value)
+        stream = self.stream_cache.get(key)
+        if stream is not None:
+            metrics.incr("stream_cache.hit")
+            self.logger.info(f"stream cache hit for EP{episode} :3")
+            return stream
+
+        metrics.incr("stream_cache.miss")
+
         try:
-            stream = anime.get_video(episode=episode, lang=LanguageTypeEnum.SUB, preferred_quality=quality)
+            stream = anime.get_video(episode=episode, lang=lang, preferred_quality=quality)
             self.logger.info(f"stream fetched: {stream} :]")
             if not stream:
                 return None
 
+            self.stream_cache.put(key, stream)
             return stream
 
         except Exception as e:
             self.logger.exception("Error fetching stream: " + str(e) + ":/")
         return None
 
-    def get_episodes(self, anime):
+    @staticmethod
+    def anime_key(anime) -> str:
+        """
+        Stable cache key for an anime across searches and restarts.
+        """
+        provider = getattr(getattr(anime, "provider", None), "NAME", "unknown")
+        return f"{provider}:{getattr(anime, 'identifier', id(anime))}"
+
+    def get_anime_info(self, anime, fetch: bool = True) -> Optional[ProviderInfoResult]:
+        """
+        Info for anime with the synopsis already cleaned, from memory or disk,
+        else from the provider when fetch is set. None if we don't have it.
+        """
+        key = self.anime_key(anime)
+        info = self.info_cache.get(key)
+        if info is not None:
+            metrics.incr("info_cache.hit")
+            return info
+
+        metrics.incr("info_cache.miss")
+        if not fetch:
+            return None
+
+        try:
+            info = anime.get_info()
+            info = dataclasses.replace(info, synopsis=clean_html(info.synopsis))
+
+        except Exception as e:
+            self.logger.error(f"Error fetching info for {getattr(anime, 'name', key)}: {e} :/")
+            return None
+
+        self.info_cache.put(key, info)
+        return info
+
+    def get_cached_episodes(self, anime) -> Optional[tuple]:
         """
-        Get list of episodes for an anime, with caching.
+        (episodes, is_fresh) from memory or disk without touching the provider,
+        None if this anime was never fetched. Memory entries age like disk ones,
+        so screens keep revalidating lists fetched earlier in the session.
         """
-        anime_id = getattr(anime, "id", id(anime))
+        key = self.anime_key(anime)
+        entry = self.episodes_cache.get(key)
+        if entry is None:
+            entry = self.episode_cache.get_entry(key)
+            if entry is None:
+                return None
+            self.episodes_cache[key] = entry
+        return entry["episodes"], self.episode_cache.is_fresh(entry["fetched_at"])
 
-        if anime_id in self.episodes_cache:
-            return self.episodes_cache[anime_id]
+    def refresh_episodes(self, anime):
+        """
+        Fetch the episode list from the provider and merge it into what we had,
+        so newly aired episodes show up. Falls back to the cached list on error.
+        """
+        key = self.anime_key(anime)
+        cached = self.get_cached_episodes(anime)
+        known = cached[0] if cached else []
 
         try:
-            episodes = anime.get_episodes(lang=LanguageTypeEnum.SUB)
+            fetched = anime.get_episodes(lang=LanguageTypeEnum.SUB)
 
         except Exception as e:
             self.logger.exception("Error fetching episodes: " + str(e))
-            return []
+            return known
+
+        episodes = sorted(set(known) | set(fetched))
+        if len(episodes) > len(known) and known:
+            self.logger.info(f"{len(episodes) - len(known)} new episode(s) for {getattr(anime, 'name', key)} :3")
 
-        self.episodes_cache[anime_id] = episodes
+        self.episodes_cache[key] = {"episodes": episodes, "fetched_at": time.time()}
+        self.episode_cache.set(key, episodes)
         return episodes
 
+    @timed("backend.get_episodes")
+    def get_episodes(self, anime):
+        """
+        Get list of episodes for an anime, from memory, then disk while fresh,
+        then the provider.
+        """
+        cached = self.get_cached_episodes(anime)
+        if cached and cached[1]:
+            return cached[0]
+
+        return self.refresh_episodes(anime)
+
+    @timed("backend.play_episode")
     def play_episode(self, anime: Anime, episode: int, stream: ProviderStream, start_time: int = 0):
         """
         Play a specific episode using MPVPlayer with user-configurable settings.
         """
         url = stream.url
-        anime_id = getattr(anime, "identifier", str(id(anime)))
         anime_name = getattr(anime, "name", "Unknown")
+        previous = (self.current_anime, self.current_episode)
         self.current_anime = anime
         self.current_episode = episode
+        self.current_url = url
 
+        if isinstance(anime, Anime):
+            try:
+                self.anime_index.add(anime)
+            except Exception as e:
+                self.logger.debug(f"Failed to index {anime_name}: {e} :/")
+            self._remember_titles([anime])
+
+        self.settings.reload_if_changed()
         start_time += self.skip_intro_seconds
         referrer = getattr(stream, 'referrer', None) or self.get_referrer_for_url(url)
 
@@ -139,37 +439,191 @@ class AnimeBackend:
         self.logger.info(f"Playing {anime_name} EP{episode} with referrer: {referrer}, "
                          f"start_time: {start_time}")
 
-        def on_mpv_exit():
-            """Called when MPV closes, save watch history"""
-            self.logger.info(f"MPV closed, saving history for {anime_name} EP:{episode} :)")
-            try:
-                elapsed = self.player.get_elapsed_time()
-                duration = self.player.current_duration or (elapsed + 300)
-                self.watch_history.update_progress(anime_id, anime_name, episode, elapsed, duration)
+        if isinstance(self.player, AsyncMPVControl):
+            self._schedule_async_play(anime, episode, url, start_time, extra_args)
+            return
+
+        if previous[0] is not None and self.player.persistent and self.player.is_alive():
+            if previous != (anime, episode):
+                self._save_final_progress(*previous)
+            self.player.load(url, start_time=start_time, options={"referrer": referrer})
+            return
+
+        self.player.on_exit = self._on_mpv_exit
+        self.player.on_end_file = self._on_episode_end
+        self.player.launch(url, start_time=start_time, extra_args=extra_args)
+
+        self.player.start_progress_tracker(self._on_progress_tick, interval=self.save_progress_interval)
+
+    def _on_mpv_exit(self):
+        """
+        Called when MPV closes, save watch history for whatever is playing now.
+        A persistent player may have loaded several episodes since launch.
+        """
+        anime, episode, url = self.current_anime, self.current_episode, self.current_url
+        self.logger.info(f"MPV closed, saving history for {getattr(anime, 'name', 'Unknown')} EP:{episode} :)")
+        if self.player.last_end_reason == "error":
+            self.stream_cache.invalidate_url(url)
+
+        try:
+            self._save_final_progress(anime, episode)
+            if self.player.persistent or self.player.last_end_reason != "eof":
+                # Closing the player is the user stopping, not the episode ending
+                return
+
+            next_up = self._resolve_next_episode(anime, episode)
+            if next_up:
+                self.play_episode(anime, *next_up)
+
+        except Exception as e:
+            self.logger.debug(f"Failed to save final progress: {e} :/")
+
+    def _on_progress_tick(self, elapsed, duration):
+        anime, episode = self.current_anime, self.current_episode
+        anime_id = getattr(anime, "identifier", str(id(anime)))
+        self.watch_history.update_progress(
+            anime_id, getattr(anime, "name", "Unknown"), episode, elapsed, duration
+        )
+        self._maybe_prefetch_next(anime, episode, elapsed, duration)
+
+    def _maybe_prefetch_next(self, anime, episode, elapsed, duration):
+        """
+        Once the current episode is past prefetch_next_at, resolve the next
+        one in the background so auto-next finds it in the stream cache.
+        """
+        if not self.auto_next_episode or not duration or elapsed / duration < self.prefetch_next_at:
+            return
+
+        key = (getattr(anime, "identifier", str(id(anime))), episode + 1, self.global_quality, LanguageTypeEnum.SUB.value)
+        with self._prefetch_lock:
+            if key in self._prefetching or key in self.stream_cache:
+                return
+            self._prefetching.add(key)
+
+        threading.Thread(target=self._prefetch_next, args=(anime, episode, key), daemon=True).start()
+
+    def _prefetch_next(self, anime, episode, key):
+        try:
+            next_ep = episode + 1
+            if next_ep > len(self.get_episodes(anime)):
+                return
+
+            if self.get_episode_stream(anime, next_ep, self.global_quality):
+                self.logger.info(f"Prefetched EP{next_ep} of {getattr(anime, 'name', 'Unknown')} :3")
+
+        except Exception as e:
+            self.logger.debug(f"Prefetch of next episode failed: {e} :/")
+
+        finally:
+            with self._prefetch_lock:
+                self._prefetching.discard(key)
+
+    def _on_episode_end(self, reason):
+        """
+        Persistent player finished a file but is still open:
+        save it, then load the next episode into the same mpv or let it go.
+        """
+        anime, episode = self.current_anime, self.current_episode
+        self.logger.info(f"{getattr(anime, 'name', 'Unknown')} EP{episode} ended ({reason}) :)")
+        if reason == "error":
+            self.stream_cache.invalidate_url(self.current_url)
+
+        try:
+            self._save_final_progress(anime, episode)
+            next_up = self._resolve_next_episode(anime, episode) if reason == "eof" else None
 
-                if self.auto_next_episode:
-                    next_ep = episode + 1
-                    episodes = self.get_episodes(anime)
+        except Exception as e:
+            self.logger.debug(f"Failed to save final progress: {e} :/")
+            next_up = None
+
+        if next_up:
+            self.play_episode(anime, *next_up)
+        else:
+            self.player.quit()
+
+    def _save_final_progress(self, anime, episode):
+        anime_id = getattr(anime, "identifier", str(id(anime)))
+        elapsed = self.player.get_elapsed_time()
+        duration = self.player.current_duration or (elapsed + 300)
+        self.watch_history.update_progress(anime_id, getattr(anime, "name", "Unknown"), episode, elapsed, duration)
+        # The last position of a session, don't leave it to the next batch
+        self.watch_history.flush()
+
+    def _resolve_next_episode(self, anime, episode):
+        """
+        (next_episode, stream) if auto next is on and there is one, else None.
+        """
+        if not self.auto_next_episode:
+            return None
+
+        next_ep = episode + 1
+        if next_ep > len(self.get_episodes(anime)):
+            return None
+
+        next_stream = self.get_episode_stream(anime, next_ep, self.global_quality)
+        if not next_stream:
+            return None
+
+        self.logger.info(f"Auto-playing next episode: EP{next_ep} :3")
+        return next_ep, next_stream
+
+    def _schedule_async_play(self, anime, episode, url, start_time, extra_args):
+        """
+        Async player: playback runs as a task on the running (Textual) loop.
+        Starting a new episode cancels whatever was playing.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+
+        except RuntimeError:
+            self.logger.error("Async player needs a running event loop :/")
+            return
+
+        if self._play_task and not self._play_task.done():
+            self._play_task.cancel()
+
+        self._play_task = loop.create_task(
+            self._play_async(anime, episode, url, start_time, extra_args, previous=self._play_task)
+        )
+
+    async def _play_async(self, anime, episode, url, start_time, extra_args, previous=None):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
 
-                    if next_ep <= len(episodes):
-                        next_stream = self.get_episode_stream(anime, next_ep, self.global_quality)
-                        if next_stream:
-                            self.logger.info(f"Auto-playing next episode: EP{next_ep} :3")
-                            self.play_episode(anime, next_ep, next_stream)
+        anime_name = getattr(anime, "name", "Unknown")
+        if not await self.player.launch(url, start_time=start_time, extra_args=extra_args):
+            return
 
+        tracker = asyncio.create_task(
+            self.player.track_progress(self._on_progress_tick, interval=self.save_progress_interval)
+        )
+        reason = None
+        try:
+            async for event in self.player.events():
+                if event.get("event") == "end-file":
+                    reason = event.get("reason")
+                    if reason == "error":
+                        self.stream_cache.invalidate_url(url)
+                    break
+
+        finally:
+            tracker.cancel()
+            self.logger.info(f"MPV closed, saving history for {anime_name} EP:{episode} :)")
+            try:
+                self._save_final_progress(anime, episode)
             except Exception as e:
                 self.logger.debug(f"Failed to save final progress: {e} :/")
+            await self.player.close()
 
-        self.player.on_exit = on_mpv_exit
-        self.player.launch(url, start_time=start_time, extra_args=extra_args)
+        if reason != "eof":
+            # The user closed mpv (or it failed), that is not the episode ending
+            return
 
-        self.player.start_progress_tracker(
-            lambda elapsed, duration: self.watch_history.update_progress(
-                anime_id, anime_name, episode, elapsed, duration
-            ),
-            interval=self.save_progress_interval
-        )
+        next_up = await asyncio.to_thread(self._resolve_next_episode, anime, episode)
+        if next_up:
+            self.play_episode(anime, *next_up)
 
+    @timed("backend.resume_anime")
     def resume_anime(self, anime_id, quality: int = None):
         """
         Resume anime playback from watch history, using user settings.
@@ -181,23 +635,12 @@ class AnimeBackend:
             self.logger.warning(f"No history found for anime_id {anime_id} :(")
             return False
 
-        anime = self.cache.get(anime_id) or (self.get_anime_by_query(entry["anime_name"]) or [None])[0]
+        anime = self.get_anime_by_id(anime_id) or self.find_anime_by_name(entry["anime_name"], anime_id)
         if not anime:
             self.logger.error("Could not find anime to resume :/")
             return False
 
-        lang = LanguageTypeEnum.SUB
-        try:
-            stream = anime.get_video(
-                episode=entry["episode"],
-                lang=lang,
-                preferred_quality=quality
-            )
-
-        except Exception as e:
-            self.logger.exception(f"Error fetching stream for resume: {e}")
-            return False
-
+        stream = self.get_episode_stream(anime, entry["episode"], quality)
         if not stream:
             self.logger.warning("No stream available to resume")
             return False
@@ -223,5 +666,12 @@ class AnimeBackend:
             )
         return result
 
+    def get_playback_timings(self) -> dict:
+        """
+        Latencies of the last mpv launch in seconds:
+        launch_to_connected and launch_to_first_frame (None until known).
+        """
+        return dict(self.player.timings)
+
     def _on_play_start(self, anime):
         self.logger.info(f"Playback started: {anime}")
\ No newline at end of file
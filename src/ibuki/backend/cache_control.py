@@ -0,0 +1,452 @@
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+
+from ..logs.logger import get_logger
+
+from anipy_api.provider import ProviderInfoResult
+from anipy_api.provider.base import Status
+
+# CacheControl v1
+
+CACHE_DIR = Path("~/Project-Ibuki/cache").expanduser()
+
+class DiskCache:
+    """
+    Small SQLite backed key/value store with per-entry TTL and
+    LRU eviction once the stored values go over a byte budget.
+    Values are anything json can handle.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 5 * 1024 * 1024):
+        self.logger = get_logger("DiskCache")
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # Every hit writes last_access, WAL + NORMAL keeps that off fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_access ON cache(last_access)")
+        self.conn.commit()
+
+    def get(self, key: str, default=None) -> Any:
+        """
+        Return the cached value for key, or default if missing/expired.
+        A hit bumps the entry to most recently used.
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    return default
+
+                value, expires_at = row
+                if expires_at <= now:
+                    self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self.conn.commit()
+                    return default
+
+                self.conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Cache read failed for {key}: {e} :/")
+            return default
+
+        try:
+            return json.loads(value)
+
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Corrupt cache entry for {key}: {e} :/")
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value: Any, ttl: float):
+        """
+        Store value under key for ttl seconds, evicting least recently
+        used entries if the cache grows past max_bytes.
+        """
+        try:
+            payload = json.dumps(value, separators=(",", ":"))
+
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Value for {key} is not cacheable: {e} :/")
+            return
+
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            self.logger.debug(f"Skipping cache for {key}, {size} bytes is over budget")
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now + ttl, now)
+                )
+                self._evict(now)
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Cache write failed for {key}: {e} :/")
+
+    def set_many(self, items: dict, ttl: float):
+        """
+        Store several key/value pairs in one transaction.
+        """
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            try:
+                payload = json.dumps(value, separators=(",", ":"))
+            except (TypeError, ValueError) as e:
+                self.logger.warning(f"Value for {key} is not cacheable: {e} :/")
+                continue
+            rows.append((key, payload, len(payload.encode("utf-8")), now + ttl, now))
+
+        if not rows:
+            return
+
+        try:
+            with self._lock:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._evict(now)
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Cache write failed for {len(rows)} entries: {e} :/")
+
+    def values(self) -> list:
+        """
+        Every live value, without touching last_access.
+        """
+        try:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT value FROM cache WHERE expires_at > ?", (time.time(),)
+                ).fetchall()
+
+        except sqlite3.Error as e:
+            self.logger.error(f"Cache scan failed: {e} :/")
+            return []
+
+        values = []
+        for (value,) in rows:
+            try:
+                values.append(json.loads(value))
+            except json.JSONDecodeError:
+                continue
+        return values
+
+    def delete(self, key: str):
+        with self._lock:
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM cache")
+            self.conn.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def _evict(self, now: float):
+        """
+        Drop expired rows, then least recently used rows until under budget.
+        Caller must hold the lock.
+        """
+        self.conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.conn.execute("SELECT key, size FROM cache ORDER BY last_access ASC").fetchall()
+        evicted = 0
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        self.logger.debug(f"Evicted {evicted} cache entries, {total} bytes left")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class SearchCache:
+    """
+    Search results cached on disk by normalized query.
+    Empty results are cached too, but only for a short while.
+    """
+
+    def __init__(
+            self,
+            db_path: Path = CACHE_DIR / "search.db",
+            ttl: float = 24 * 60 * 60,
+            empty_ttl: float = 5 * 60,
+            max_bytes: int = 5 * 1024 * 1024
+    ):
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.casefold().split())
+
+    def get(self, query: str) -> Optional[list]:
+        """
+        Return the cached list of result dicts, [] for a cached miss,
+        or None if the query has to go to the provider.
+        """
+        return self.store.get(self.normalize(query))
+
+    def set(self, query: str, results: list):
+        ttl = self.ttl if results else self.empty_ttl
+        self.store.set(self.normalize(query), results, ttl)
+
+class EpisodeCache:
+    """
+    Episode lists on disk by stable anime key, kept around long after they
+    go stale so screens can show them instantly while a refresh runs.
+    """
+
+    def __init__(
+            self,
+            db_path: Path = CACHE_DIR / "episodes.db",
+            fresh_for: float = 60 * 60,
+            keep_for: float = 30 * 24 * 60 * 60,
+            max_bytes: int = 5 * 1024 * 1024
+    ):
+        self.fresh_for = fresh_for
+        self.keep_for = keep_for
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+
+    def is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.fresh_for
+
+    def get_entry(self, key: str) -> Optional[dict]:
+        """{"episodes", "fetched_at"} or None if we never saw this anime."""
+        return self.store.get(key)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        (episodes, is_fresh) or None if we never saw this anime.
+        """
+        entry = self.get_entry(key)
+        if entry is None:
+            return None
+        return entry["episodes"], self.is_fresh(entry["fetched_at"])
+
+    def set(self, key: str, episodes: list):
+        self.store.set(key, {"episodes": episodes, "fetched_at": time.time()}, self.keep_for)
+
+class AnimeIndex:
+    """
+    Provider identifier -> what it takes to rebuild an Anime
+    (provider name, identifier, name, languages). Filled from every search
+    and playback so resuming never needs a search round-trip.
+    """
+
+    def __init__(
+            self,
+            db_path: Path = CACHE_DIR / "anime_index.db",
+            keep_for: float = 365 * 24 * 60 * 60,
+            max_bytes: int = 10 * 1024 * 1024
+    ):
+        self.keep_for = keep_for
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+
+    @staticmethod
+    def _entry(anime) -> dict:
+        return {
+            "provider": getattr(anime.provider, "NAME", None),
+            "identifier": anime.identifier,
+            "name": anime.name,
+            "languages": sorted(getattr(lang, "value", lang) for lang in anime.languages),
+        }
+
+    def add(self, anime):
+        self.store.set(anime.identifier, self._entry(anime), self.keep_for)
+
+    def add_many(self, anime_list):
+        self.store.set_many({anime.identifier: self._entry(anime) for anime in anime_list}, self.keep_for)
+
+    def get(self, identifier: str) -> Optional[dict]:
+        return self.store.get(identifier)
+
+    def entries(self) -> list:
+        return self.store.values()
+
+class InfoCache:
+    """
+    ProviderInfoResults by stable anime key, synopsis already cleaned.
+    The most recent ones stay in memory (LRU), everything is kept on disk
+    for ttl seconds so details open without a provider call across restarts.
+    """
+
+    def __init__(
+            self,
+            db_path: Path = CACHE_DIR / "info.db",
+            ttl: float = 7 * 24 * 60 * 60,
+            max_entries: int = 256,
+            max_bytes: int = 10 * 1024 * 1024
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store = DiskCache(db_path, max_bytes=max_bytes)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _to_dict(info: ProviderInfoResult) -> dict:
+        entry = asdict(info)
+        entry["status"] = info.status.value if info.status is not None else None
+        return entry
+
+    @staticmethod
+    def _from_dict(entry: dict) -> ProviderInfoResult:
+        entry = dict(entry)
+        if entry.get("status") is not None:
+            entry["status"] = Status(entry["status"])
+        return ProviderInfoResult(**entry)
+
+    def _remember(self, key: str, info: ProviderInfoResult):
+        with self._lock:
+            self._memory[key] = info
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[ProviderInfoResult]:
+        with self._lock:
+            info = self._memory.get(key)
+            if info is not None:
+                self._memory.move_to_end(key)
+                return info
+
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+
+        try:
+            info = self._from_dict(entry)
+        except (TypeError, ValueError):
+            self.store.delete(key)
+            return None
+
+        self._remember(key, info)
+        return info
+
+    def put(self, key: str, info: ProviderInfoResult):
+        self._remember(key, info)
+        self.store.set(key, self._to_dict(info), self.ttl)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+class StreamCache:
+    """
+    Resolved ProviderStreams kept in memory by (identifier, episode, quality, language).
+    Stream urls are usually signed, so an entry lives until shortly before the
+    url's own expiry when it can be read from the url, default_ttl otherwise.
+    """
+
+    EXPIRY_PARAMS = ("expires", "expire", "expiry", "exp", "e", "valid_until")
+
+    def __init__(self, default_ttl: float = 600, margin: float = 30):
+        self.logger = get_logger("StreamCache")
+        self.default_ttl = default_ttl
+        self.margin = margin
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def url_lifetime(cls, url: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until a signed url expires, or None if it does not say.
+        Understands epoch style params (expires=, exp=, ...) and S3 style
+        X-Amz-Date + X-Amz-Expires.
+        """
+        now = time.time() if now is None else now
+        params = {k.lower(): v[0] for k, v in parse_qs(urlparse(url).query).items()}
+
+        if "x-amz-date" in params and "x-amz-expires" in params:
+            try:
+                signed_at = datetime.strptime(params["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+                return signed_at.timestamp() + int(params["x-amz-expires"]) - now
+            except ValueError:
+                pass
+
+        for name in cls.EXPIRY_PARAMS:
+            value = params.get(name)
+            if value and value.isdigit() and int(value) > 1_000_000_000:
+                return int(value) - now
+
+        return None
+
+    def get(self, key: tuple):
+        with self._lock:
+            stream, expires_at = self._entries.get(key, (None, 0))
+            if stream is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+        return stream
+
+    def put(self, key: tuple, stream):
+        ttl = self.default_ttl
+        lifetime = self.url_lifetime(getattr(stream, "url", "") or "")
+        if lifetime is not None:
+            ttl = min(ttl, lifetime - self.margin)
+
+        if ttl <= 0:
+            self.logger.debug(f"Not caching stream for {key}, url is about to expire")
+            return
+
+        with self._lock:
+            self._entries[key] = (stream, time.monotonic() + ttl)
+
+    def invalidate_url(self, url: str):
+        """Forget every entry pointing at url, e.g. after mpv failed to load it."""
+        with self._lock:
+            stale = [key for key, (stream, _) in self._entries.items() if getattr(stream, "url", None) == url]
+            for key in stale:
+                del self._entries[key]
+
+        if stale:
+            self.logger.info(f"Dropped {len(stale)} cached stream(s) that failed to load :/")
+
+    def __contains__(self, key: tuple) -> bool:
+        return self.get(key) is not None
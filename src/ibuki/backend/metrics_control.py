@@ -0,0 +1,130 @@
+import json
+import time
+import logging
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+from ..logs.logger import get_logger
+
+# MetricsControl v1
+
+class LatencyHistogram:
+    """
+    Rolling window of the last `window` latencies (seconds) with percentiles.
+    """
+
+    def __init__(self, window: int = 200):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p in [0, 100], None until there is at least one sample."""
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+
+        index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        return len(self.samples)
+
+class MetricsRegistry:
+    """
+    Process-wide counters and latency histograms.
+    Spans feed both and log one JSON record each to the "Metrics" logger.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("Metrics")
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """
+        Time the block as `name`: one histogram sample, a `name.calls` count,
+        `name.errors` if it raises, and a structured INFO record.
+        Extra fields go into the record as-is.
+        """
+        started = time.perf_counter()
+        ok = True
+        try:
+            yield fields
+
+        except BaseException:
+            ok = False
+            raise
+
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe(name, elapsed)
+            self.incr(f"{name}.calls")
+            if not ok:
+                self.incr(f"{name}.errors")
+
+            if self.logger.isEnabledFor(logging.INFO):
+                record = {"span": name, "ms": round(elapsed * 1000, 2), "ok": ok, **fields}
+                self.logger.info(json.dumps(record, default=str))
+
+    def timed(self, name: str):
+        """Decorator form of span()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        """
+        {"counters": {name: n}, "histograms": {name: {count, p50, p95, max}}} in seconds.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+
+        return {
+            "counters": counters,
+            "histograms": {
+                name: {
+                    "count": h.count,
+                    "p50": h.percentile(50),
+                    "p95": h.percentile(95),
+                    "max": h.percentile(100),
+                }
+                for name, h in histograms.items()
+            },
+        }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+metrics = MetricsRegistry()
+span = metrics.span
+timed = metrics.timed
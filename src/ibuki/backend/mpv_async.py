@@ -0,0 +1,274 @@
+import json
+import time
+import asyncio
+import itertools
+from pathlib import Path
+
+from .mpv_control import MPVControl, MPVError
+from ..logs.logger import get_logger
+
+# AsyncMPVControl v1
+
+class AsyncMPVControl:
+    """
+    MPVControl for an asyncio loop (the Textual app's), no threads involved.
+    The subprocess, IPC socket, replies and events all live on the loop:
+    commands are awaitable and everything mpv pushes comes out of events().
+    """
+
+    OBSERVED_PROPERTIES = MPVControl.OBSERVED_PROPERTIES
+
+    def __init__(self, sock_path="/tmp/ibuki-mpv.sock"):
+        self.logger = get_logger("AsyncMPVControl")
+        self.sock_path = sock_path
+        self.process = None
+        self.reader = None
+        self.writer = None
+        self.running = False
+        self.command_timeout = 2.0
+        self.state = {}
+        self._reset_state()
+
+        self._request_ids = itertools.count(1)
+        self._pending = {}
+        self._events = asyncio.Queue()
+        self._read_task = None
+        self.timings = {"launch_to_connected": None, "launch_to_first_frame": None}
+        self._launched_at = None
+
+    def _reset_state(self):
+        self.state = {
+            "time-pos": None,
+            "duration": None,
+            "pause": False,
+            "paused-for-cache": False,
+            "eof-reached": False,
+        }
+
+    @property
+    def current_duration(self):
+        return self.state["duration"]
+
+    def get_current_state(self):
+        return self.state["time-pos"], self.state["duration"]
+
+    def get_elapsed_time(self):
+        position, _ = self.get_current_state()
+        return int(position) if position is not None else 0
+
+    def _cleanup_socket(self):
+        try:
+            Path(self.sock_path).unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to clean up socket: {e} :(")
+
+    async def launch(self, url, start_time=0, extra_args=None, connect_timeout=5.0):
+        """
+        Start mpv and connect to its IPC socket.
+        Returns True once connected and observing playback state.
+        """
+        self._cleanup_socket()
+        self.timings = {"launch_to_connected": None, "launch_to_first_frame": None}
+        self._launched_at = time.monotonic()
+        cmd = [
+            url,
+            f"--start={start_time}",
+            f"--input-ipc-server={self.sock_path}",
+            "--force-window=immediate",
+            "--no-terminal",
+            "--idle=no",
+            "--keep-open=no",
+        ] + (extra_args or [])
+
+        self.logger.info(f"Launching MPV with socket: {self.sock_path}")
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                "mpv", *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to start MPV process: {e}")
+            return False
+
+        self._reset_state()
+        if not await self.connect(connect_timeout):
+            await self.close()
+            return False
+
+        self.timings["launch_to_connected"] = time.monotonic() - self._launched_at
+        self.logger.info(f"Connected to MPV socket in {self.timings['launch_to_connected'] * 1000:.0f}ms")
+        return True
+
+    async def connect(self, timeout=5.0):
+        """
+        Connect to the socket as soon as mpv creates it, backing off briefly
+        between attempts and giving up early if the process dies.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.005
+
+        while loop.time() < deadline:
+            if self.process and self.process.returncode is not None:
+                stderr = await self.process.stderr.read() if self.process.stderr else b""
+                self.logger.error(f"MPV died immediately! Exit code: {self.process.returncode}")
+                self.logger.error(f"STDERR: {stderr.decode('utf-8', errors='ignore')}")
+                return False
+
+            try:
+                self.reader, self.writer = await asyncio.open_unix_connection(self.sock_path)
+                break
+
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+        else:
+            self.logger.error("Failed to connect to MPV socket in time!")
+            return False
+
+        self.running = True
+        self._events = asyncio.Queue()
+        self._read_task = asyncio.create_task(self._read_loop())
+        await self.command_batch(
+            [["observe_property", i, name] for i, name in enumerate(self.OBSERVED_PROPERTIES, start=1)]
+        )
+        return True
+
+    async def _read_loop(self):
+        try:
+            while self.running:
+                line = await self.reader.readline()
+                if not line:
+                    break
+
+                try:
+                    msg = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.logger.warning(f"JSON decode error {e} :/")
+                    continue
+
+                if "request_id" in msg and "event" not in msg:
+                    future = self._pending.pop(msg["request_id"], None)
+                    if future and not future.done():
+                        if msg.get("error") == "success":
+                            future.set_result(msg.get("data"))
+                        else:
+                            future.set_exception(MPVError(msg.get("error")))
+                    continue
+
+                if msg.get("event") == "playback-restart" and self._launched_at is not None \
+                        and self.timings["launch_to_first_frame"] is None:
+                    self.timings["launch_to_first_frame"] = time.monotonic() - self._launched_at
+
+                if msg.get("event") == "property-change":
+                    name, value = msg.get("name"), msg.get("data")
+                    if name in self.state and not (value is None and name in ("time-pos", "duration")):
+                        self.state[name] = value
+
+                self._events.put_nowait(msg)
+
+        except Exception as e:
+            self.logger.error(f"Error in MPV IPC reader: {e} :/")
+
+        finally:
+            self.running = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("mpv connection closed"))
+            self._pending.clear()
+            self._events.put_nowait(None)
+
+    async def command_batch(self, commands, timeout=None):
+        """
+        Send several commands in one write and wait for all replies.
+        Failed commands come back as exceptions in the result list.
+        """
+        loop = asyncio.get_running_loop()
+        request_ids = []
+        futures = []
+        lines = []
+        for command in commands:
+            request_id = next(self._request_ids)
+            future = loop.create_future()
+            self._pending[request_id] = future
+            request_ids.append(request_id)
+            futures.append(future)
+            lines.append(json.dumps({"command": list(command), "request_id": request_id}))
+
+        try:
+            self.writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+            await self.writer.drain()
+
+        except Exception as e:
+            self.logger.error(f"Failed to send command to MPV: {e} :/")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(ConnectionError(f"mpv socket unavailable: {e}"))
+
+        await asyncio.wait(futures, timeout=self.command_timeout if timeout is None else timeout)
+
+        results = []
+        for request_id, future in zip(request_ids, futures):
+            if not future.done():
+                self._pending.pop(request_id, None)
+                future.cancel()
+                results.append(TimeoutError("mpv did not answer in time"))
+            elif future.exception() is not None:
+                results.append(future.exception())
+            else:
+                results.append(future.result())
+        return results
+
+    async def command(self, *command, timeout=None):
+        """
+        Send one command and return its reply data, raises on error or timeout.
+        """
+        result = (await self.command_batch([command], timeout=timeout))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def events(self):
+        """
+        Yield every event mpv sends until the connection closes.
+        """
+        while True:
+            msg = await self._events.get()
+            if msg is None:
+                return
+            yield msg
+
+    async def track_progress(self, callback, interval=10):
+        """
+        callback(elapsed_seconds, total_duration) every interval seconds while playing.
+        Runs as a task on the loop, cancel it to stop.
+        """
+        while self.running:
+            position, duration = self.get_current_state()
+            if position is not None:
+                try:
+                    callback(int(position), int(duration) if duration is not None else int(position) + 300)
+                except Exception as e:
+                    self.logger.error(f"Error tracking progress: {e} :/")
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        self.running = False
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+        if self.process and self.process.returncode is None:
+            try:
+                self.process.terminate()
+                await self.process.wait()
+            except Exception as e:
+                self.logger.error(f"Failed to terminate MPV process: {e} :/")
+
+        if self._read_task and self._read_task is not asyncio.current_task():
+            await asyncio.gather(self._read_task, return_exceptions=True)
+        self._cleanup_socket()
@@ -1,26 +1,87 @@
 import time
 import json
 import socket
+import itertools
 import threading
 import subprocess
 from pathlib import Path
+from concurrent.futures import Future
 
+from .metrics_control import timed
 from ..logs.logger import get_logger
 
 # MPVControl v2
 
+class MPVError(Exception):
+    """mpv answered a command with something other than "success"."""
+
 class MPVControl:
-    def __init__(self, sock_path="/tmp/ibuki-mpv.sock"):
+    # Properties mpv pushes to us through observe_property, the index is the observer id
+    OBSERVED_PROPERTIES = ("time-pos", "duration", "pause", "paused-for-cache", "eof-reached")
+
+    def __init__(self, sock_path="/tmp/ibuki-mpv.sock", persistent=False):
         self.logger = get_logger("MPVControl")
         self.sock_path = sock_path
+        self.persistent = persistent
         self.process = None
         self.socket = None
         self.running = False
         self._progress_thread = None
+        self._progress_callback = None
         self.on_exit = None
+        self.on_end_file = None
+        self.last_end_reason = None
         self._recv_buffer = ""
-        self.current_duration = None
-        self._current_position = None
+        self.state = {}
+        self._reset_state()
+        self.timings = {"launch_to_connected": None, "launch_to_first_frame": None}
+        self._launched_at = None
+
+        self.command_timeout = 2.0
+        self._request_ids = itertools.count(1)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _reset_state(self):
+        self.state = {
+            "time-pos": None,
+            "duration": None,
+            "pause": False,
+            "paused-for-cache": False,
+            "eof-reached": False,
+        }
+
+    @property
+    def current_duration(self):
+        return self.state["duration"]
+
+    @property
+    def _current_position(self):
+        return self.state["time-pos"]
+
+    def _observe_properties(self):
+        for observer_id, name in enumerate(self.OBSERVED_PROPERTIES, start=1):
+            self.send("observe_property", [observer_id, name])
+
+    def _on_property_change(self, name, value):
+        """
+        Keep the live snapshot current. time-pos and duration go away when the
+        file unloads, so their last known values are kept for the exit handler.
+        """
+        if name not in self.state:
+            return
+
+        if value is None and name in ("time-pos", "duration"):
+            return
+
+        self.state[name] = value
+
+    def _on_playback_restart(self):
+        """First playback-restart after a launch means the first frame is up."""
+        if self.timings["launch_to_first_frame"] is None and self._launched_at is not None:
+            self.timings["launch_to_first_frame"] = time.monotonic() - self._launched_at
+            self.logger.info(f"First frame {self.timings['launch_to_first_frame'] * 1000:.0f}ms after launch :3")
 
     def _cleanup_socket(self):
         try:
@@ -30,6 +91,7 @@ class MPVControl:
         except Exception as e:
             self.logger.error(f"Failed to clean up socket: {e} :(")
 
+    @timed("mpv.launch")
     def launch(self, url, start_time=0, extra_args=None):
         if extra_args is None:
             extra_args = []
@@ -43,12 +105,12 @@ class MPVControl:
                   f"--input-ipc-server={self.sock_path}",
                   "--force-window=immediate",
                   "--no-terminal",
-                  "--idle=no",
+                  "--idle=yes" if self.persistent else "--idle=no",
                   "--keep-open=no",
               ] + extra_args
 
         self.logger.info(f"Launching MPV with socket: {self.sock_path}")
-        self.logger.debug(f"MPV command: {' '.join(cmd[:4])}... (truncated)")
+        self.logger.debug("MPV command: %s... (truncated)", cmd[:4])
 
         try:
             self.process = subprocess.Popen(
@@ -58,64 +120,79 @@ class MPVControl:
             )
         except Exception as e:
             self.logger.error(f"Failed to start MPV process: {e}")
-            return
+            return False
 
         self.running = True
-        self.current_duration = None
-        self._current_position = None
+        self._reset_state()
         self._recv_buffer = ""
+        self.last_end_reason = None
+        self.timings = {"launch_to_connected": None, "launch_to_first_frame": None}
+        self._launched_at = time.monotonic()
 
-        time.sleep(0.5)
-        if self.process.poll() is not None:
-            stdout, stderr = self.process.communicate()
-            self.logger.error(f"MPV died immediately! Exit code: {self.process.returncode}")
-            self.logger.error(f"STDOUT: {stdout.decode('utf-8', errors='ignore')}")
-            self.logger.error(f"STDERR: {stderr.decode('utf-8', errors='ignore')}")
+        if not self.connect():
             self.running = False
-            return
+            return False
 
-        connected = False
-        for attempt in range(50):
-            if Path(self.sock_path).exists():
-                try:
-                    self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                    self.socket.connect(self.sock_path)
-                    self.socket.settimeout(0.5)
-                    self.logger.info(f"Connected to MPV socket on attempt {attempt + 1}")
-                    connected = True
-                    break
-                except Exception as e:
-                    if self.socket:
-                        try:
-                            self.socket.close()
+        self.timings["launch_to_connected"] = time.monotonic() - self._launched_at
+        self.logger.info(f"Connected to MPV socket in {self.timings['launch_to_connected'] * 1000:.0f}ms")
 
-                        except:
-                            pass
-                        self.socket = None
-                    time.sleep(0.1)
-            else:
-                time.sleep(0.1)
+        threading.Thread(target=self._listen_ipc, daemon=True).start()
+        self._observe_properties()
+        return True
 
-        if not connected:
-            self.logger.error("Failed to connect to MPV socket after 50 attempts!")
-            self.running = False
-            return
+    def connect(self, timeout=5.0):
+        """
+        Connect to the IPC socket as soon as mpv creates it.
+        Retries with short exponential backoff and bails out as soon as
+        the process dies instead of waiting out the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.005
+        attempt = 0
+
+        while time.monotonic() < deadline:
+            attempt += 1
+            if self.process and self.process.poll() is not None:
+                stdout, stderr = self.process.communicate()
+                self.logger.error(f"MPV died immediately! Exit code: {self.process.returncode}")
+                self.logger.error(f"STDOUT: {stdout.decode('utf-8', errors='ignore')}")
+                self.logger.error(f"STDERR: {stderr.decode('utf-8', errors='ignore')}")
+                return False
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.sock_path)
 
-        if self.socket:
-            threading.Thread(target=self._listen_ipc, daemon=True).start()
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+                continue
+
+            sock.settimeout(0.5)
+            self.socket = sock
+            self.logger.debug("MPV socket ready on attempt %d", attempt)
+            return True
+
+        self.logger.error(f"Failed to connect to MPV socket after {attempt} attempts!")
+        return False
 
     def _listen_ipc(self):
         """
         Listen for JSON events from MPV with proper buffer handling.
+        The listener only ever reads its own socket and calls on_exit after it
+        has cleaned up, so on_exit may launch a new mpv (and a new listener).
         """
-        if not self.socket:
+        sock = self.socket
+        if not sock:
             self.logger.error("Cannot start IPC listener - socket is None!")
             return
 
+        exited = False
         try:
-            while self.running:
+            while self.running and self.socket is sock and not exited:
                 try:
-                    data = self.socket.recv(4096)
+                    data = sock.recv(4096)
                     if not data:
                         break
 
@@ -132,67 +209,150 @@ class MPVControl:
                             self.logger.warning(f"JSON decode error {e} :/")
                             continue
 
-                        if msg.get("error") == "success" and "data" in msg:
-                            request_id = msg.get("request_id", 0)
-                            if request_id == 1:
-                                self._current_position = msg["data"]
-
-                            elif request_id == 2:
-                                self.current_duration = msg["data"]
+                        if "request_id" in msg and "event" not in msg:
+                            self._resolve(msg)
+                            continue
 
                         event = msg.get("event")
-                        if event == "end-file":
-                            self.running = False
-
-                            if self.on_exit:
-                                self.on_exit()
+                        if event == "property-change":
+                            self._on_property_change(msg.get("name"), msg.get("data"))
+
+                        elif event == "playback-restart":
+                            self._on_playback_restart()
+
+                        elif event == "end-file":
+                            reason = msg.get("reason")
+                            self.last_end_reason = reason
+                            if self.persistent and reason != "quit":
+                                # The player stays up: "stop" is us replacing the file,
+                                # "eof"/"error" means the episode is over.
+                                if reason in ("eof", "error") and self.on_end_file:
+                                    self.on_end_file(reason)
+                                continue
+
+                            exited = True
                             break
 
                 except socket.timeout:
-                    continue
+                    pass
+
+                self._expire_pending()
 
         except Exception as e:
             self.logger.error(f"Error in MPV IPC listener: {e} :/")
 
         finally:
-            self.running = False
-            self.close()
+            if self.socket is sock:
+                self.close()
+
+        if exited and self.on_exit:
+            self.on_exit()
 
-    def send(self, command, args=None, request_id=0):
+    def _resolve(self, msg):
+        with self._pending_lock:
+            pending = self._pending.pop(msg["request_id"], None)
+        if pending is None:
+            return
+
+        future, _ = pending
+        if msg.get("error") == "success":
+            future.set_result(msg.get("data"))
+        else:
+            future.set_exception(MPVError(msg.get("error")))
+
+    def _expire_pending(self):
+        """Fail requests whose per-call timeout has passed."""
+        now = time.monotonic()
+        with self._pending_lock:
+            expired = [rid for rid, (_, deadline) in self._pending.items() if deadline <= now]
+            futures = [self._pending.pop(rid)[0] for rid in expired]
+
+        for future in futures:
+            future.set_exception(TimeoutError("mpv did not answer in time"))
+
+    def _fail_pending(self, error: Exception):
+        with self._pending_lock:
+            futures = [future for future, _ in self._pending.values()]
+            self._pending.clear()
+
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def command_batch(self, commands, timeout=None):
         """
-        Send a command to MPV IPC with optional request_id for tracking responses.
+        Send several commands in a single write.
+        commands: list of lists, e.g. [["get_property", "time-pos"], ["set_property", "pause", True]]
+        Returns one Future per command, resolved with the reply's data when it arrives.
         """
-        if args is None:
-            args = []
+        timeout = self.command_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        futures = {}
+        lines = []
+
+        with self._pending_lock:
+            for command in commands:
+                request_id = next(self._request_ids)
+                future = Future()
+                self._pending[request_id] = (future, deadline)
+                futures[request_id] = future
+                lines.append(json.dumps({"command": list(command), "request_id": request_id}))
 
         try:
-            payload = json.dumps({"command": [command] + args, "request_id": request_id})
-            self.socket.send(payload.encode("utf-8") + b"\n")
+            with self._write_lock:
+                self.socket.sendall(("\n".join(lines) + "\n").encode("utf-8"))
 
         except Exception as e:
             self.logger.error(f"Failed to send command to MPV: {e} :/")
+            with self._pending_lock:
+                for request_id in futures:
+                    self._pending.pop(request_id, None)
+            for future in futures.values():
+                future.set_exception(ConnectionError(f"mpv socket unavailable: {e}"))
 
-    def get_current_state(self):
+        return list(futures.values())
+
+    def command(self, *command, timeout=None) -> Future:
         """
-        Get current playback position and duration.
-        Returns: (position, duration) or (None, None)
+        Send one command, returns a Future for its reply.
         """
-        try:
-            self.send("get_property", ["time-pos"], request_id=1)
-            self.send("get_property", ["duration"], request_id=2)
+        return self.command_batch([command], timeout=timeout)[0]
 
-            time.sleep(0.1)
-            return self._current_position, self.current_duration
+    def request(self, *command, timeout=None):
+        """
+        Send one command and wait for its reply data.
+        Returns None if mpv errors, times out or is gone.
+        """
+        timeout = self.command_timeout if timeout is None else timeout
+        try:
+            return self.command(*command, timeout=timeout).result(timeout=timeout + 0.5)
 
         except Exception as e:
-            self.logger.error(f"Failed to get playback state: {e} :/")
-            return None, None
+            self.logger.debug("MPV command %s failed: %r", command[0], e)
+            return None
+
+    def send(self, command, args=None) -> Future:
+        """
+        Fire a command at MPV IPC, the returned Future can be ignored.
+        """
+        return self.command(command, *(args or []))
+
+    def get_current_state(self):
+        """
+        Get current playback position and duration from the observed snapshot.
+        Returns: (position, duration) or (None, None)
+        """
+        return self.state["time-pos"], self.state["duration"]
 
     def start_progress_tracker(self, callback, interval=10):
         """
         callback(elapsed_seconds, total_duration)
         Tracks MPV's actual playback time AND duration.
+        Only one tracker thread runs per player, calling this again just swaps the callback.
         """
+        self._progress_callback = callback
+        if self._progress_thread and self._progress_thread.is_alive():
+            return
 
         def _track():
             while self.running:
@@ -200,11 +360,11 @@ class MPVControl:
                     position, duration = self.get_current_state()
 
                     if position is not None and duration is not None:
-                        callback(int(position), int(duration))
+                        self._progress_callback(int(position), int(duration))
 
                     elif position is not None:
                         self.logger.debug("Duration not available yet, using estimated")
-                        callback(int(position), int(position) + 300)
+                        self._progress_callback(int(position), int(position) + 300)
 
                 except Exception as e:
                     self.logger.error(f"Error tracking progress: {e} :/")
@@ -214,6 +374,32 @@ class MPVControl:
         self._progress_thread = threading.Thread(target=_track, daemon=True)
         self._progress_thread.start()
 
+    def is_alive(self) -> bool:
+        """mpv is running and we are connected to it."""
+        return bool(self.running and self.socket and self.process and self.process.poll() is None)
+
+    def load(self, url, start_time=0, options=None):
+        """
+        Play url in the already running mpv (persistent mode) with loadfile replace.
+        options are per-file mpv options such as {"referrer": ...}; they are set
+        in the same write as the loadfile so they apply to this file.
+        """
+        self._reset_state()
+        self.timings = {"launch_to_connected": 0.0, "launch_to_first_frame": None}
+        self._launched_at = time.monotonic()
+
+        commands = [["set_property", "start", str(start_time)]]
+        for name, value in (options or {}).items():
+            commands.append(["set_property", name, value])
+        commands.append(["loadfile", url, "replace"])
+
+        self.logger.info(f"Loading next file into running MPV, start: {start_time}")
+        return self.command_batch(commands)[-1]
+
+    def quit(self):
+        """Ask mpv to exit, the listener cleans up when the socket closes."""
+        self.send("quit")
+
     def get_elapsed_time(self):
         """
         Get current elapsed time synchronously.
@@ -223,6 +409,7 @@ class MPVControl:
 
     def close(self):
         self.running = False
+        self._fail_pending(ConnectionError("mpv connection closed"))
         if self.process:
             try:
                 self.process.terminate()
@@ -0,0 +1,217 @@
+import time
+import random
+import threading
+from typing import Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics_control import LatencyHistogram, metrics
+from ..logs.logger import get_logger
+
+# ProviderControl v1
+
+_session = None
+_limiter = None
+_hedge_pool = None
+_shared_lock = threading.Lock()
+
+class SharedSession(requests.Session):
+    """
+    The session handed to every provider. anipy closes a provider's session
+    after a connection error before making itself a new one; closing this one
+    would drop the pooled connections under every other thread, so close()
+    leaves it open. urllib3 already discards the broken connection.
+    """
+
+    def close(self):
+        pass
+
+def get_shared_session(pool_size: int = 16) -> requests.Session:
+    """One pooled HTTP session for every provider in the process."""
+    global _session
+    with _shared_lock:
+        if _session is None:
+            _session = SharedSession()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def get_limiter(max_in_flight: int = 8) -> threading.BoundedSemaphore:
+    """Process-wide cap on provider calls in flight, sized by whoever asks first."""
+    global _limiter
+    with _shared_lock:
+        if _limiter is None:
+            _limiter = threading.BoundedSemaphore(max_in_flight)
+        return _limiter
+
+def get_hedge_pool() -> ThreadPoolExecutor:
+    """Small pool that runs hedged calls so the caller can wait on whichever finishes first."""
+    global _hedge_pool
+    with _shared_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ibuki-hedge")
+        return _hedge_pool
+
+class RetryBudget:
+    """
+    Token bucket that keeps retries a small fraction of traffic.
+    Every call earns `ratio` tokens (up to `max_tokens`), every retry spends one,
+    so a provider that is down gets a handful of retries, not a retry storm.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+class ProviderAdapter:
+    """
+    Wraps any anipy provider (or anything with the same methods) with the shared
+    HTTP session, the global in-flight limit and jittered retries within a budget.
+    Anime objects built on top of the adapter go through it as well.
+    """
+
+    def __init__(
+            self,
+            provider,
+            max_retries: int = 3,
+            max_in_flight: int = 8,
+            backoff_base: float = 0.2,
+            backoff_cap: float = 2.0,
+            budget: Optional[RetryBudget] = None,
+            hedge: bool = False,
+            hedge_min_samples: int = 20,
+            hedge_floor: float = 0.05
+    ):
+        self.logger = get_logger("ProviderAdapter")
+        self.provider = provider
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = get_limiter(max_in_flight)
+        self.budget = budget or RetryBudget()
+        self.session = get_shared_session()
+        self._attach_session()
+
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_floor = hedge_floor
+        self.hedges_fired = 0
+        self.latency = defaultdict(LatencyHistogram)
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    def _attach_session(self):
+        # anipy swaps in a fresh Session after a connection error, put ours back
+        if hasattr(self.provider, "session") and self.provider.session is not self.session:
+            self.provider.session = self.session
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def call(self, method: str, *args, **kwargs):
+        """
+        Run provider.<method>(*args, **kwargs) under the limiter, retrying
+        transient failures with full-jitter backoff while the budget allows.
+        """
+        attempt = 0
+        while True:
+            self._attach_session()
+            try:
+                with self.limiter:
+                    started = time.monotonic()
+                    result = getattr(self.provider, method)(*args, **kwargs)
+                    elapsed = time.monotonic() - started
+                    self.latency[method].record(elapsed)
+                    metrics.observe(f"provider.{method}", elapsed)
+                self.budget.deposit()
+                return result
+
+            except Exception as e:
+                attempt += 1
+                metrics.incr(f"provider.{method}.errors")
+                if not self._is_retryable(e) or attempt > self.max_retries:
+                    raise
+
+                if not self.budget.withdraw():
+                    self.logger.warning(f"Retry budget spent, giving up on {method} :/")
+                    raise
+
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+                self.logger.debug("%s failed (%r), retry %d in %.2fs", method, e, attempt, delay)
+                time.sleep(delay)
+
+    def get_search(self, *args, **kwargs):
+        return self.call("get_search", *args, **kwargs)
+
+    def get_info(self, *args, **kwargs):
+        return self.call("get_info", *args, **kwargs)
+
+    def get_episodes(self, *args, **kwargs):
+        return self.call("get_episodes", *args, **kwargs)
+
+    def hedge_threshold(self, method: str) -> Optional[float]:
+        """Rolling p95 for method, None while there are too few samples to trust it."""
+        histogram = self.latency[method]
+        if len(histogram) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_floor, histogram.percentile(95))
+
+    def call_hedged(self, method: str, *args, **kwargs):
+        """
+        Like call(), but if the first attempt is slower than the rolling p95,
+        fire an identical second one and return whichever answers first.
+        The loser is left to finish in the background and ignored.
+        """
+        threshold = self.hedge_threshold(method)
+        if threshold is None:
+            return self.call(method, *args, **kwargs)
+
+        pool = get_hedge_pool()
+        futures = [pool.submit(self.call, method, *args, **kwargs)]
+        done, _ = wait(futures, timeout=threshold)
+
+        if not done:
+            self.hedges_fired += 1
+            metrics.incr(f"provider.{method}.hedged")
+            self.logger.debug("%s slower than p95 (%.2fs), hedging :3", method, threshold)
+            futures.append(pool.submit(self.call, method, *args, **kwargs))
+
+        pending = set(futures)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+                error = error or future.exception()
+
+        raise error
+
+    def get_video(self, *args, **kwargs):
+        if self.hedge:
+            return self.call_hedged("get_video", *args, **kwargs)
+        return self.call("get_video", *args, **kwargs)
@@ -1,13 +1,21 @@
+import os
 import json
 import yaml
+import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Optional
 
 from ..logs.logger import get_logger
 
 # Animesettings v1
 # 90% of the code in this file is by Claude lol
 
+# libyaml when PyYAML was built with it, the pure Python ones otherwise
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 class AnimeSettings:
     DEFAULT_SETTINGS = {
         "quality": 1080,
@@ -17,10 +25,26 @@ class AnimeSettings:
         "skip_intro_seconds": 0,
         "skip_outro_seconds": 0,
         "auto_next_episode": False,
+        "prefetch_next_at": 0.8,
+        "player_engine": "thread",
+        "persistent_player": True,
 
         "save_progress_interval": 30,
         "minimal_progress_threshold": 0.1,
         "history_limit": 50,
+        "history_engine": "json",
+        "log_level": "INFO",
+
+        "provider_max_retries": 3,
+        "provider_max_in_flight": 8,
+        "hedge_stream_requests": False,
+
+        "search_cache_ttl": 86400,
+        "search_cache_empty_ttl": 300,
+        "search_cache_max_bytes": 5242880,
+        "stream_cache_ttl": 600,
+        "episode_cache_fresh_for": 3600,
+        "info_cache_ttl": 604800,
     }
 
     def __init__(
@@ -39,6 +63,12 @@ class AnimeSettings:
             self.config_path = config_dir / f"settings.{ext}"
 
         self.settings: Dict[str, Any] = self.DEFAULT_SETTINGS.copy()
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._pending = {}
+        self._mtime = None
         self._ensure_config_dir()
         self.load()
 
@@ -46,22 +76,22 @@ class AnimeSettings:
         """Create config directory if it doesn't exist"""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def load(self):
-        """Load settings from disk, create defaults if missing"""
-        if not self.config_path.exists():
-            self.logger.info(f"No config found at {self.config_path}, creating defaults")
-            self.save()
-            return
+    def _is_yaml(self, path: Path) -> bool:
+        return self.use_yaml and path.suffix in ['.yaml', '.yml']
 
+    def _stat_mtime(self) -> Optional[int]:
         try:
-            with open(self.config_path, 'r') as f:
-                if self.use_yaml and self.config_path.suffix in ['.yaml', '.yml']:
-                    loaded = yaml.safe_load(f) or {}
-                else:
-                    loaded = json.load(f)
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
 
-            self.settings.update(loaded)
-            self.logger.info(f"Settings loaded from {self.config_path}")
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Settings file contents, None if it could not be read"""
+        try:
+            with open(self.config_path, 'r') as f:
+                if self._is_yaml(self.config_path):
+                    return yaml.load(f, Loader=YamlLoader) or {}
+                return json.load(f)
 
         except yaml.YAMLError as e:
             self.logger.error(f"Invalid YAML in config: {e}, using defaults :|")
@@ -72,27 +102,149 @@ class AnimeSettings:
         except Exception as e:
             self.logger.error(f"Failed to load settings: {e}, using defaults :|")
 
-    def save(self):
-        """Persist current settings to disk"""
-        try:
-            self._ensure_config_dir()
-
-            with open(self.config_path, 'w') as f:
-                if self.use_yaml and self.config_path.suffix in ['.yaml', '.yml']:
-                    yaml.dump(
-                        self.settings,
-                        f,
-                        default_flow_style=False,
-                        sort_keys=False,
-                        indent=2
-                    )
-                else:
-                    json.dump(self.settings, f, indent=2)
+        return None
 
-            self.logger.debug(f"Settings saved to {self.config_path} :)")
+    def load(self):
+        """Load settings from disk, create defaults if missing"""
+        if not self.config_path.exists():
+            self.logger.info(f"No config found at {self.config_path}, creating defaults")
+            self.save()
+            return
 
-        except Exception as e:
-            self.logger.error(f"Failed to save settings: {e} :(")
+        mtime = self._stat_mtime()
+        loaded = self._read()
+        self._mtime = mtime
+        if loaded is None:
+            return
+
+        self.settings.update(loaded)
+        self.logger.info(f"Settings loaded from {self.config_path}")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Re-read the file only if its mtime moved since we last read or wrote it,
+        e.g. after a hand edit. Subscribers get the keys that changed.
+        """
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+
+        loaded = self._read()
+        with self._lock:
+            self._mtime = mtime
+            if loaded is None:
+                return False
+
+            fresh = {**self.DEFAULT_SETTINGS, **loaded}
+            changes = {key: value for key, value in fresh.items() if self.settings.get(key) != value}
+            self.settings = fresh
+
+        self.logger.info(f"Settings reloaded from {self.config_path}, {len(changes)} changed")
+        self._notify(changes)
+        return True
+
+    def save(self):
+        """
+        Persist current settings to disk. The file is written next to the
+        config and renamed over it, so a crash never leaves half a file.
+        Inside batch() this only marks the settings dirty.
+        """
+        with self._lock:
+            if self._batch_depth:
+                self._dirty = True
+                return
+
+            tmp_path = None
+            try:
+                self._ensure_config_dir()
+                with tempfile.NamedTemporaryFile(
+                        'w',
+                        dir=self.config_path.parent,
+                        prefix=f".{self.config_path.name}.",
+                        suffix=".tmp",
+                        delete=False
+                ) as f:
+                    tmp_path = f.name
+                    if self._is_yaml(self.config_path):
+                        yaml.dump(
+                            self.settings,
+                            f,
+                            Dumper=YamlDumper,
+                            default_flow_style=False,
+                            sort_keys=False,
+                            indent=2
+                        )
+                    else:
+                        json.dump(self.settings, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                os.replace(tmp_path, self.config_path)
+                tmp_path = None
+                self._mtime = self._stat_mtime()
+                self._dirty = False
+                self.logger.debug(f"Settings saved to {self.config_path} :)")
+
+            except Exception as e:
+                self.logger.error(f"Failed to save settings: {e} :(")
+
+            finally:
+                if tmp_path:
+                    Path(tmp_path).unlink(missing_ok=True)
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect every change made inside the block, then write the file once
+        and tell subscribers once. Batches nest, the outermost one writes.
+
+            with settings.batch():
+                settings.set("quality", 720)
+                settings.reset_key("fullscreen")
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+                if outermost:
+                    changes, self._pending = self._pending, {}
+                    if self._dirty:
+                        self.save()
+
+            if outermost:
+                self._notify(changes)
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """callback({key: new_value}) after every change, once per batch"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _changed(self, changes: Dict[str, Any]):
+        """Queue changes for the current batch, or notify right away"""
+        if not changes:
+            return
+        with self._lock:
+            if self._batch_depth:
+                self._pending.update(changes)
+                return
+        self._notify(changes)
+
+    def _notify(self, changes: Dict[str, Any]):
+        if not changes:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(dict(changes))
+            except Exception as e:
+                self.logger.error(f"Settings subscriber {callback} failed: {e} :/")
 
     def get(self, key: str, default=None):
         """Get a setting value with optional default"""
@@ -106,26 +258,36 @@ class AnimeSettings:
             value: New value
             save: Whether to immediately persist to disk (default: True)
         """
-        old_value = self.settings.get(key)
-        self.settings[key] = value
+        with self._lock:
+            old_value = self.settings.get(key)
+            self.settings[key] = value
 
-        if save:
-            self.save()
+            if save:
+                self.save()
 
         if old_value != value:
             self.logger.info(f"Setting '{key}' changed: {old_value} -> {value}")
+            self._changed({key: value})
 
     def update_multiple(self, updates: Dict[str, Any]):
         """Update multiple settings at once"""
-        self.settings.update(updates)
-        self.save()
+        with self._lock:
+            changes = {key: value for key, value in updates.items() if self.settings.get(key) != value}
+            self.settings.update(updates)
+            self.save()
+
         self.logger.info(f"Updated {len(updates)} settings")
+        self._changed(changes)
 
     def reset(self):
         """Reset to default settings"""
-        self.settings = self.DEFAULT_SETTINGS.copy()
-        self.save()
+        with self._lock:
+            changes = {key: value for key, value in self.DEFAULT_SETTINGS.items() if self.settings.get(key) != value}
+            self.settings = self.DEFAULT_SETTINGS.copy()
+            self.save()
+
         self.logger.info("Settings reset to defaults")
+        self._changed(changes)
 
     def reset_key(self, key: str):
         """Reset a single setting to its default value"""
@@ -144,7 +306,7 @@ class AnimeSettings:
         try:
             with open(path, 'w') as f:
                 if path.suffix in ['.yaml', '.yml']:
-                    yaml.dump(self.settings, f, default_flow_style=False, indent=2)
+                    yaml.dump(self.settings, f, Dumper=YamlDumper, default_flow_style=False, indent=2)
                 else:
                     json.dump(self.settings, f, indent=2)
             self.logger.info(f"Settings exported to {path}")
@@ -156,12 +318,11 @@ class AnimeSettings:
         try:
             with open(path, 'r') as f:
                 if path.suffix in ['.yaml', '.yml']:
-                    loaded = yaml.safe_load(f)
+                    loaded = yaml.load(f, Loader=YamlLoader)
                 else:
                     loaded = json.load(f)
 
-            self.settings.update(loaded)
-            self.save()
+            self.update_multiple(loaded)
             self.logger.info(f"Settings imported from {path}")
 
         except Exception as e:
@@ -169,7 +330,7 @@ class AnimeSettings:
 
     def __str__(self):
         """Pretty print current settings"""
-        return yaml.dump(self.settings, default_flow_style=False, sort_keys=False)
+        return yaml.dump(self.settings, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
 
     def __repr__(self):
         return f"<AnimeSettings config_path={self.config_path}>"
@@ -0,0 +1,126 @@
+import re
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import Levenshtein
+
+# TitleControl v1
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+def normalize_title(title: str) -> str:
+    """casefolded, punctuation dropped, single spaces."""
+    return " ".join(_NON_WORD.sub(" ", title.casefold()).split())
+
+def title_similarity(query: str, title: str) -> float:
+    """
+    0..1 Levenshtein similarity of query to title. A query shorter than the
+    title is also compared with every run of the same number of words in it,
+    so "frieern" still scores high against "Sousou no Frieren".
+    """
+    query, title = normalize_title(query), normalize_title(title)
+    if not query or not title:
+        return 0.0
+
+    best = Levenshtein.ratio(query, title)
+    words = title.split()
+    size = len(query.split())
+    if size < len(words):
+        for start in range(len(words) - size + 1):
+            best = max(best, Levenshtein.ratio(query, " ".join(words[start:start + size])))
+    return best
+
+class TitleIndex:
+    """
+    Offline fuzzy index over show titles.
+    Trigrams narrow tens of thousands of titles down to a few hundred
+    candidates, which are then ranked by title_similarity.
+    """
+
+    def __init__(self, candidates: int = 200):
+        self.candidates = candidates
+        self.titles = {}
+        self._grams = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        text = f"  {text} "
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key: str, title: str):
+        if not title:
+            return
+
+        normalized = normalize_title(title)
+        with self._lock:
+            previous = self.titles.get(key)
+            if previous and previous[1] == normalized:
+                return
+            if previous:
+                for gram in self._trigrams(previous[1]):
+                    self._grams.get(gram, set()).discard(key)
+
+            self.titles[key] = (title, normalized)
+            for gram in self._trigrams(normalized):
+                self._grams.setdefault(gram, set()).add(key)
+
+    def add_many(self, items):
+        """items: iterable of (key, title)."""
+        for key, title in items:
+            self.add(key, title)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.titles.get(key)
+        return entry[0] if entry else None
+
+    def match(self, query: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        [(key, title)] whose title contains every word of query, partial words
+        included, so "frie" finds "Sousou no Frieren" while it is being typed.
+        Titles starting with the query come first, then shorter ones.
+        """
+        normalized = normalize_title(query)
+        words = normalized.split()
+        if not words:
+            return []
+
+        with self._lock:
+            titles = list(self.titles.items())
+
+        matches = [
+            (key, title, title_normalized) for key, (title, title_normalized) in titles
+            if all(word in title_normalized for word in words)
+        ]
+        matches.sort(key=lambda m: (not m[2].startswith(normalized), len(m[1])))
+        return [(key, title) for key, title, _ in matches[:limit]]
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.6) -> List[Tuple[str, str, float]]:
+        """
+        [(key, title, score)] best first, only matches scoring at least min_score.
+        """
+        normalized = normalize_title(query)
+        if not normalized:
+            return []
+
+        overlap = Counter()
+        with self._lock:
+            for gram in self._trigrams(normalized):
+                overlap.update(self._grams.get(gram, ()))
+            candidates = [(key, self.titles[key]) for key, _ in overlap.most_common(self.candidates)]
+
+        scored = []
+        for key, (title, title_normalized) in candidates:
+            score = title_similarity(normalized, title_normalized)
+            if score >= min_score:
+                scored.append((key, title, score))
+
+        scored.sort(key=lambda m: (-m[2], len(m[1])))
+        return scored[:limit]
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, key):
+        return key in self.titles
@@ -1,6 +1,11 @@
+import os
 import re
 import html
 import json
+import time
+import atexit
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
 
@@ -8,60 +13,219 @@ from ..logs.logger import get_logger
 
 # Utils v3
 
+_TAGS = re.compile(r'<.*?>')
+
 def clean_html(raw: str | None) -> str:
     if not raw:
         return "Not available :("
 
-    text = re.sub(r'<.*?>', '', raw).strip()
+    text = _TAGS.sub('', raw).strip()
     return html.unescape(text)
 
 PROGRESS_FILE = Path("~/Project-Ibuki/progress.json").expanduser()
+HISTORY_DB = Path("~/Project-Ibuki/history.db").expanduser()
+
+def is_resumable(timestamp, total_duration) -> bool:
+    """Started, but not (nearly) finished."""
+    return 5 < timestamp < total_duration * 0.95
+
+def make_entry(anime_name, episode, timestamp, total_duration) -> dict:
+    percent = 0
+    if total_duration > 0:
+        percent = round((timestamp / total_duration) * 100, 1)
+
+    return {
+        "anime_name": anime_name,
+        "episode": episode,
+        "timestamp": timestamp,
+        "total_duration": total_duration,
+        "last_watched": datetime.now().isoformat(),
+        "progress_percent": percent,
+    }
 
 class WatchHistory:
-    def __init__(self, file_path=PROGRESS_FILE):
-        self.file_path = file_path
+    """
+    Watch progress keyed by anime id.
+    progress.json is only the last compacted snapshot, every change goes
+    to an append-only journal next to it first. The journal is flushed in
+    small batches and folded back into the snapshot in the background,
+    so a write costs the same no matter how big the history is.
+    """
+
+    def __init__(
+            self,
+            file_path=PROGRESS_FILE,
+            flush_every: int = 8,
+            flush_interval: float = 5.0,
+            compact_after: int = 1000
+    ):
+        self.file_path = Path(file_path)
+        self.journal_path = self.file_path.with_name(self.file_path.name + ".journal")
+        self.old_journal_path = self.file_path.with_name(self.file_path.name + ".journal.old")
         self.logger = get_logger("WatchHistory")
+
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self._journal = None
+        self._journal_records = 0
+        self._last_flush = time.monotonic()
+        self._compact_thread = None
+
         self.history = self.load()
+        atexit.register(self.close)
 
     def load(self):
+        history = {}
         if self.file_path.exists():
             try:
-                return json.loads(self.file_path.read_text())
+                history = json.loads(self.file_path.read_text())
 
             except Exception as e:
                 self.logger.error("Failed to load watch history: " + str(e) + ":/")
-                return {}
 
-        return {}
+        self._journal_records = 0
+        for path in (self.old_journal_path, self.journal_path):
+            self._journal_records += self._replay(path, history)
 
-    def save(self):
+        return history
+
+    def _replay(self, path: Path, history: dict) -> int:
+        """
+        Apply journal records from path onto history, returns how many were applied.
+        A torn last line from a crash is skipped.
+        """
+        if not path.exists():
+            return 0
+
+        applied = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+
+                    except json.JSONDecodeError:
+                        self.logger.warning(f"Skipping torn journal record in {path.name} :/")
+                        continue
+
+                    if record.get("op") == "set":
+                        history[record["id"]] = record["entry"]
+                    elif record.get("op") == "del":
+                        history.pop(record["id"], None)
+                    applied += 1
+
+        except Exception as e:
+            self.logger.error(f"Failed to replay journal {path}: {e} :/")
+
+        return applied
+
+    def _append(self, record: dict):
+        with self._lock:
+            self._pending.append(json.dumps(record, separators=(",", ":")))
+            if (len(self._pending) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush(self):
+        """Write any batched journal records to disk."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+
+            try:
+                if self._journal is None:
+                    self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+                self._journal.write("\n".join(self._pending) + "\n")
+                self._journal.flush()
+                self._journal_records += len(self._pending)
+                self._pending.clear()
+
+            except Exception as e:
+                self.logger.error("Failed to write watch history journal: " + str(e) + ":/")
+                return
+
+            if self._journal_records >= self.compact_after:
+                self.compact(background=True)
+
+    def compact(self, background: bool = False):
+        """
+        Fold the journal into a fresh snapshot.
+        The live journal is rotated out under the lock so writes can keep going
+        while the snapshot is written, then swapped in with an atomic rename.
+        """
+        with self._lock:
+            if self._compact_thread and self._compact_thread.is_alive():
+                return
+
+            self.flush()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+            if self.journal_path.exists() and not self.old_journal_path.exists():
+                os.replace(self.journal_path, self.old_journal_path)
+
+            snapshot = dict(self.history)
+            self._journal_records = 0
+
+        if background:
+            self._compact_thread = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+            self._compact_thread.start()
+
+        else:
+            self._write_snapshot(snapshot)
+
+    def _write_snapshot(self, snapshot: dict):
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
         try:
-            self.file_path.write_text(json.dumps(self.history, indent=2))
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, self.file_path)
+            self.old_journal_path.unlink(missing_ok=True)
+            self.logger.debug(f"Compacted watch history, {len(snapshot)} entries :3")
 
         except Exception as e:
             self.logger.error("Failed to save watch history: " + str(e) + ":/")
 
+    def save(self):
+        """Write a full snapshot right now."""
+        self.compact()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+        if self._compact_thread:
+            self._compact_thread.join()
+
     def update_progress(self, anime_id, anime_name, episode, timestamp, total_duration):
-        percent = 0
-        if total_duration > 0:
-            percent = round((timestamp / total_duration) * 100, 1)
-
-        self.history[anime_id] = {
-            "anime_name": anime_name,
-            "episode": episode,
-            "timestamp": timestamp,
-            "total_duration": total_duration,
-            "last_watched": datetime.now().isoformat(),
-            "progress_percent": percent,
-        }
-        self.save()
-        self.logger.debug(f"Updated {anime_name} EP{episode}: {timestamp}s :3")
+        entry = make_entry(anime_name, episode, timestamp, total_duration)
+        with self._lock:
+            self.history[anime_id] = entry
+            self._append({"op": "set", "id": anime_id, "entry": entry})
+        self.logger.debug("Updated %s EP%s: %ss :3", anime_name, episode, timestamp)
 
     def get_continue_watching(self, limit=10):
         active = {}
 
-        for k, v in self.history.items():
-            if 5 < v["timestamp"] < v["total_duration"] * 0.95:
+        for k, v in list(self.history.items()):
+            if is_resumable(v["timestamp"], v["total_duration"]):
                 active[k] = v
 
         sorted_items = sorted(
@@ -73,7 +237,159 @@ class WatchHistory:
         return self.history.get(anime_id)
 
     def remove_entry(self, anime_id):
-        if anime_id in self.history:
+        with self._lock:
+            if anime_id not in self.history:
+                return
+
             del self.history[anime_id]
-            self.save()
+            self._append({"op": "del", "id": anime_id})
+            self.flush()
+        self.logger.info(f"Removed {anime_id} from watch history >:3")
+
+class SQLiteWatchHistory:
+    """
+    Same API as WatchHistory, backed by SQLite instead of json.
+    Whether an entry can be resumed is stored with it and indexed together
+    with last_watched, so continue watching is a LIMIT query instead of a
+    full scan and sort. progress.json is imported once on first open.
+    """
+
+    COLUMNS = ("anime_name", "episode", "timestamp", "total_duration", "last_watched", "progress_percent")
+
+    def __init__(self, db_path=HISTORY_DB, migrate_from=PROGRESS_FILE):
+        self.db_path = Path(db_path)
+        self.logger = get_logger("WatchHistory")
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "anime_id TEXT PRIMARY KEY, "
+            "anime_name TEXT NOT NULL, "
+            "episode NUMERIC NOT NULL, "
+            "timestamp INTEGER NOT NULL, "
+            "total_duration INTEGER NOT NULL, "
+            "last_watched TEXT NOT NULL, "
+            "progress_percent REAL NOT NULL, "
+            "resumable INTEGER NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_resume ON history(resumable, last_watched)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+        if migrate_from is not None:
+            self._migrate(Path(migrate_from))
+
+    def _migrate(self, json_path: Path):
+        """One-time import of the json history (snapshot plus journal)."""
+        with self._lock:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        if done:
+            return
+
+        legacy = WatchHistory(file_path=json_path)
+        legacy.close()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(anime_id, entry) for anime_id, entry in legacy.history.items()]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (str(json_path),)
+            )
+            self.conn.commit()
+
+        if legacy.history:
+            self.logger.info(f"Migrated {len(legacy.history)} entries from {json_path} :3")
+
+    @staticmethod
+    def _to_row(anime_id, entry: dict) -> tuple:
+        return (
+            anime_id,
+            entry["anime_name"],
+            entry["episode"],
+            entry["timestamp"],
+            entry["total_duration"],
+            entry["last_watched"],
+            entry["progress_percent"],
+            int(is_resumable(entry["timestamp"], entry["total_duration"])),
+        )
+
+    def _to_entry(self, row) -> dict:
+        return dict(zip(self.COLUMNS, row))
+
+    @property
+    def history(self) -> dict:
+        """Full history as a dict, only here for compatibility. Avoid on hot paths."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT anime_id, " + ", ".join(self.COLUMNS) + " FROM history"
+            ).fetchall()
+        return {row[0]: self._to_entry(row[1:]) for row in rows}
+
+    def load(self):
+        return self.history
+
+    def save(self):
+        with self._lock:
+            self.conn.commit()
+
+    def flush(self):
+        self.save()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+    def update_progress(self, anime_id, anime_name, episode, timestamp, total_duration):
+        entry = make_entry(anime_name, episode, timestamp, total_duration)
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self._to_row(anime_id, entry)
+                )
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            self.logger.error("Failed to save watch history: " + str(e) + ":/")
+            return
+
+        self.logger.debug("Updated %s EP%s: %ss :3", anime_name, episode, timestamp)
+
+    def get_continue_watching(self, limit=10):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT anime_id, " + ", ".join(self.COLUMNS) + " FROM history "
+                "WHERE resumable = 1 ORDER BY last_watched DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [(row[0], self._to_entry(row[1:])) for row in rows]
+
+    def get_entry(self, anime_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT " + ", ".join(self.COLUMNS) + " FROM history WHERE anime_id = ?",
+                (anime_id,)
+            ).fetchone()
+        return self._to_entry(row) if row else None
+
+    def remove_entry(self, anime_id):
+        with self._lock:
+            removed = self.conn.execute("DELETE FROM history WHERE anime_id = ?", (anime_id,)).rowcount
+            self.conn.commit()
+
+        if removed:
             self.logger.info(f"Removed {anime_id} from watch history >:3")
+
+def load_watch_history(engine: str = "json"):
+    """Open the watch history with the configured storage engine ("json" or "sqlite")."""
+    if engine == "sqlite":
+        return SQLiteWatchHistory()
+    return WatchHistory()
@@ -1,27 +1,99 @@
 # Logger writen by ChatGPT cuz I couldn't be arsed to do it myself
+# Callers only put records on a queue, one background thread formats and writes them
+import atexit
+import queue
 import logging
-import os
+import threading
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-def get_logger(name: str = "app_logger") -> logging.Logger:
-    logger = logging.getLogger(name)
-    if not logger.hasHandlers():
-        logger.setLevel(logging.DEBUG)
+LOG_DIR = Path.home() / "Project-Ibuki" / "logs"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
 
-        os.makedirs("logs", exist_ok=True)
-        log_path = os.path.join("logs", "logs.log")
+_queue = queue.SimpleQueue()
+_listener = None
+_level = logging.DEBUG
+_loggers = set()
+_lock = threading.Lock()
 
-        fh = logging.FileHandler(log_path, mode="a")
-        fh.setLevel(logging.DEBUG)
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands the record over untouched.
+    The stock one formats the message on the calling thread; here the
+    listener thread does it, so a filtered-in debug line costs a queue put.
+    That also means %-args are read later on another thread: pass values or
+    snapshots (settings.get_all()), never objects other threads still change.
+    """
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        fh.setFormatter(formatter)
+    def prepare(self, record):
+        return record
 
-        logger.addHandler(fh)
-    return logger
+_handler = DeferredQueueHandler(_queue)
 
-default_logger = get_logger()
+def configure_logging(log_dir: Path = LOG_DIR, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT) -> Path:
+    """
+    (Re)start the background writer on log_dir/logs.log, rotated by size.
+    Returns the log file path.
+    """
+    global _listener
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = log_dir / "logs.log"
+
+    fh = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    fh.setFormatter(logging.Formatter(
+        "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+
+        _listener = QueueListener(_queue, fh)
+        _listener.start()
+    return log_path
+
+def shutdown_logging():
+    """Write out everything still queued and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
 
+atexit.register(shutdown_logging)
 
+def set_log_level(level):
+    """
+    Level for every logger made by get_logger, as a name ("INFO") or number.
+    Records below it are dropped before anything is formatted or queued.
+    """
+    global _level
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if not isinstance(level, int):
+        get_logger("Logger").warning(f"Unknown log level {level}, keeping {logging.getLevelName(_level)} :/")
+        return
+
+    _level = level
+    for name in _loggers:
+        logging.getLogger(name).setLevel(level)
+
+def get_logger(name: str = "app_logger") -> logging.Logger:
+    logger = logging.getLogger(name)
+    if not logger.hasHandlers():
+        if _listener is None:
+            configure_logging()
+
+        logger.setLevel(_level)
+        logger.addHandler(_handler)
+        _loggers.add(name)
+    return logger
+
+default_logger = get_logger()
@@ -1,7 +1,9 @@
+from textual import work
 from textual.screen import Screen
 from textual.widgets import Static, Footer
 from textual.app import ComposeResult
 from anipy_api.anime import Anime
+from ..backend.backend_v3 import AnimeBackend
 
 class AnimeDetailScreen(Screen):
     BINDINGS = [
@@ -9,16 +11,37 @@ class AnimeDetailScreen(Screen):
     ]
     CSS_PATH = '../css/details_styles.css'
 
-    def __init__(self, anime: Anime, synopsis: str):
+    def __init__(self, anime: Anime, backend: AnimeBackend):
         super().__init__()
         self.anime = anime
-        self.synopsis = synopsis
+        self.backend = backend
+        self.info = None
 
     def compose(self) -> ComposeResult:
-        info = self.anime.get_info()
-        yield Static(info.name, classes='detail_title')
-        yield Static(self.synopsis, classes='detail_synopsis')
+        """Info the search already fetched is shown as is, anything else loads in the background."""
+        info = self.info = self.backend.get_anime_info(self.anime, fetch=False)
+        yield Static(info.name if info and info.name else self.anime.name, id='detail_title', classes='detail_title')
+        yield Static(info.synopsis if info else 'Synopsis still loading... :3', id='detail_synopsis', classes='detail_synopsis')
         yield Footer()
 
+    def on_mount(self):
+        if self.info is None:
+            self.load_info()
+
+    @work(thread=True, exclusive=True, group='info')
+    def load_info(self) -> None:
+        info = self.backend.get_anime_info(self.anime)
+        self.app.call_from_thread(self._show_info, info)
+
+    def _show_info(self, info) -> None:
+        self.info = info
+        if info is None:
+            self.query_one('#detail_synopsis', Static).update('Not available :(')
+            return
+
+        if info.name:
+            self.query_one('#detail_title', Static).update(info.name)
+        self.query_one('#detail_synopsis', Static).update(info.synopsis)
+
     def action_go_back(self):
-        self.app.pop_screen()
\ No newline at end of file
+        self.app.pop_screen()
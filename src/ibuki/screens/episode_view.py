@@ -1,48 +1,216 @@
+from bisect import bisect_left
+
+from rich.segment import Segment
+from textual import work
 from textual.screen import Screen
 from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from ..backend.backend_v3 import AnimeBackend
-from textual.widgets import ListView, ListItem, Static, Footer
+from textual.widgets import Input, Static, Footer
+
+class EpisodeList(ScrollView, can_focus=True):
+    """
+    Episode list drawn with the line API: rows are rendered on demand,
+    so a 5000 episode series opens as fast as a 12 episode one.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "page_up", "Page Up", show=False),
+        Binding("pagedown", "page_down", "Page Down", show=False),
+        Binding("home", "first", "First", show=False),
+        Binding("end", "last", "Last", show=False),
+        Binding("enter", "select", "Play", show=False),
+    ]
+    COMPONENT_CLASSES = {"episode-list--cursor", "episode-list--watched"}
+
+    cursor = reactive(0, always_update=True)
+
+    class Selected(Message):
+        """An episode was picked with enter or a click."""
+
+        def __init__(self, episode_list: "EpisodeList", index: int, episode):
+            super().__init__()
+            self.episode_list = episode_list
+            self.index = index
+            self.episode = episode
+
+    def __init__(self, placeholder: str = "Loading episodes... :3", **kwargs):
+        super().__init__(**kwargs)
+        self.episodes = []
+        self.placeholder = placeholder
+        self.watched = None
+
+    def set_episodes(self, episodes, placeholder: str = "No episodes found."):
+        """Replace the rows, the cursor stays on the same episode if it still exists."""
+        current = self.episodes[self.cursor] if self.episodes else None
+        self.episodes = list(episodes)
+        self.placeholder = placeholder
+        # Labels are short, rows never scroll sideways
+        self.virtual_size = Size(0, max(1, len(self.episodes)))
+
+        if current is not None:
+            self.jump_to(current)
+        else:
+            self.cursor = min(self.cursor, max(0, len(self.episodes) - 1))
+        # The new virtual size only applies after the next layout
+        self.call_after_refresh(self._scroll_to_cursor)
+
+    def index_of(self, episode) -> int:
+        """Row of episode, or of the closest one after it (episodes are sorted)."""
+        index = bisect_left(self.episodes, episode)
+        return min(index, max(0, len(self.episodes) - 1))
+
+    def jump_to(self, episode):
+        if self.episodes:
+            self.cursor = self.index_of(episode)
+
+    def _label(self, episode) -> str:
+        return f"Ep {episode}" + ("  - continue here" if episode == self.watched else "")
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        index = int(self.scroll_y) + y
+        style = self.rich_style
+
+        if not self.episodes:
+            text = self.placeholder if index == 0 else ""
+            return Strip([Segment(text.ljust(width), style)]).crop(0, width)
+
+        if index >= len(self.episodes):
+            return Strip.blank(width, style)
+
+        episode = self.episodes[index]
+        if index == self.cursor:
+            style += self.get_component_rich_style("episode-list--cursor")
+        elif episode == self.watched:
+            style += self.get_component_rich_style("episode-list--watched")
+
+        label = f" {self._label(episode)}".ljust(width)
+        return Strip([Segment(label, style)]).crop(0, width)
+
+    def _scroll_to_cursor(self) -> None:
+        height = max(1, self.scrollable_content_region.height)
+        if self.cursor < self.scroll_y:
+            self.scroll_to(y=self.cursor, animate=False)
+        elif self.cursor >= self.scroll_y + height:
+            self.scroll_to(y=self.cursor - height + 1, animate=False)
+
+    def watch_cursor(self, cursor: int) -> None:
+        self._scroll_to_cursor()
+        self.refresh()
+
+    def on_resize(self) -> None:
+        self._scroll_to_cursor()
+
+    def _move(self, delta: int):
+        if self.episodes:
+            self.cursor = max(0, min(len(self.episodes) - 1, self.cursor + delta))
+
+    def action_cursor_up(self):
+        self._move(-1)
+
+    def action_cursor_down(self):
+        self._move(1)
+
+    def action_page_up(self):
+        page = max(1, self.scrollable_content_region.height)
+        self.scroll_to(y=max(0, self.scroll_y - page), animate=False)
+        self._move(-page)
+
+    def action_page_down(self):
+        page = max(1, self.scrollable_content_region.height)
+        self.scroll_to(y=self.scroll_y + page, animate=False)
+        self._move(page)
+
+    def action_first(self):
+        self._move(-len(self.episodes))
+
+    def action_last(self):
+        self._move(len(self.episodes))
+
+    def action_select(self):
+        if self.episodes:
+            self.post_message(self.Selected(self, self.cursor, self.episodes[self.cursor]))
+
+    def on_click(self, event) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None or not self.episodes:
+            return
+        index = int(self.scroll_y) + offset.y
+        if index < len(self.episodes):
+            self.cursor = index
+            self.action_select()
 
 class EpisodeDetailScreen(Screen):
     BINDINGS = [
         ("escape", "go_back", "Go Back"),
+        ("j", "jump", "Jump to Episode"),
     ]
     CSS_PATH = '../css/episode_styles.css'
 
-    def __init__(self, anime):
+    def __init__(self, anime, backend: AnimeBackend):
         super().__init__()
         self.anime = anime
-        self.backend = AnimeBackend()
+        self.backend = backend
         self.episodes = []
 
     def compose(self) -> ComposeResult:
         yield Static(self.anime.name, id="title")
-        yield ListView(id="episode_list")
+        yield Input(placeholder="Jump to episode...", id="jump", type="number")
+        yield EpisodeList(id="episode_list")
         yield Footer()
 
     def on_mount(self):
-        episode_list = self.query_one("#episode_list", ListView)
-        self.episodes = self.backend.get_episodes(self.anime)
+        episode_list = self.query_one("#episode_list", EpisodeList)
+        anime_id = getattr(self.anime, "identifier", str(id(self.anime)))
+        entry = self.backend.watch_history.get_entry(anime_id)
+        if entry:
+            episode_list.watched = entry["episode"]
 
-        if not self.episodes:
-            episode_list.append(ListItem(Static("No episodes found.")))
-            return
+        cached = self.backend.get_cached_episodes(self.anime)
+        if cached:
+            self._show_episodes(cached[0])
+        episode_list.focus()
 
-        for idx, ep_num in enumerate(self.episodes):
-            label = f"Ep {ep_num}"
-            item = ListItem(Static(label))
-            item.index = idx
-            episode_list.append(item)
+        if not cached or not cached[1]:
+            self.refresh_episodes()
 
-    def on_list_view_selected(self, event: ListView.Selected) -> None:
-        """Handle when user clicks or presses enter on an episode"""
-        selected_item = event.item
-        ep_index = getattr(selected_item, "index", None)
+    @work(thread=True, exclusive=True, group="episodes")
+    def refresh_episodes(self) -> None:
+        """Stale-while-revalidate: fetch in the background, merge in whatever aired since."""
+        episodes = self.backend.refresh_episodes(self.anime)
+        self.app.call_from_thread(self._show_episodes, episodes)
 
-        if ep_index is None:
+    def _show_episodes(self, episodes):
+        episode_list = self.query_one("#episode_list", EpisodeList)
+        first_load = not self.episodes
+        self.episodes = list(episodes)
+        episode_list.set_episodes(self.episodes)
+
+        if first_load and episode_list.watched is not None:
+            episode_list.jump_to(episode_list.watched)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        episode_list = self.query_one("#episode_list", EpisodeList)
+        try:
+            episode = float(event.value)
+        except ValueError:
             return
 
-        episode_number = self.episodes[ep_index]
+        episode_list.jump_to(int(episode) if episode.is_integer() else episode)
+        event.input.value = ""
+        episode_list.focus()
+
+    def on_episode_list_selected(self, event: EpisodeList.Selected) -> None:
+        """Handle when user clicks or presses enter on an episode"""
+        episode_number = event.episode
 
         stream = self.backend.get_episode_stream(
             self.anime,
@@ -63,5 +231,8 @@ class EpisodeDetailScreen(Screen):
 
         self.backend.play_episode(self.anime, episode_number, stream, start_time)
 
+    def action_jump(self):
+        self.query_one("#jump", Input).focus()
+
     def action_go_back(self):
-        self.app.pop_screen()
\ No newline at end of file
+        self.app.pop_screen()
@@ -1,12 +1,15 @@
+from typing import TYPE_CHECKING
+
+from textual import work
 from textual.screen import Screen
 from textual.app import ComposeResult
 from textual.containers import Vertical
 from textual.widgets import Static, Footer, Header, Button
 
-from .search import SearchScreen
-from .settings import SettingsScreen
-from ..backend.backend_v3 import AnimeBackend
-from .continue_watching import ContinueWatchingScreen
+# The other screens (and through them anipy_api and the backend) are imported
+# when they are opened, so the home screen draws without waiting on them.
+if TYPE_CHECKING:
+    from ..backend.backend_v3 import AnimeBackend
 
 class IbukiHome(Screen):
     CSS_PATH = "../css/home_styles.css"
@@ -24,11 +27,17 @@ class IbukiHome(Screen):
         ("s", "search", "Search Anime"),
         ("c", "continue", "Continue Watching"),
         ("t", "settings", "Settings"),
+        ("d", "metrics", "Debug Metrics"),
     ]
 
-    def __init__(self, backend: AnimeBackend, **kwargs):
+    def __init__(self, backend: "AnimeBackend" = None, **kwargs):
         super().__init__(**kwargs)
-        self.backend = backend
+        self._backend = backend
+
+    @property
+    def backend(self) -> "AnimeBackend":
+        """The backend passed in, else the app's, which is built on first use."""
+        return self._backend or self.app.backend
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=False)
@@ -43,16 +52,28 @@ class IbukiHome(Screen):
         yield Static("v3.1.0", classes="footer-note")
         yield Footer()
 
+    def on_mount(self) -> None:
+        self.warm_up()
+
+    @work(thread=True, exclusive=True, group="warm-up")
+    def warm_up(self) -> None:
+        """
+        Once home is on screen, import the search screen and build the
+        backend off the UI thread so the first search does not pay for it.
+        """
+        from . import search
+        self.backend
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
         if button_id == "search":
-            self.app.push_screen(SearchScreen())
+            self.action_search()
 
         elif button_id == "continue":
-            self.app.push_screen(ContinueWatchingScreen(self.backend))
+            self.action_continue()
 
         elif button_id == "settings":
-            self.app.push_screen(SettingsScreen(self.backend))
+            self.action_settings()
 
         elif button_id == "quit":
             self.app.exit()
@@ -61,10 +82,17 @@ class IbukiHome(Screen):
         self.app.exit()
 
     def action_search(self) -> None:
-        self.app.push_screen(SearchScreen())
+        from .search import SearchScreen
+        self.app.push_screen(SearchScreen(self.backend))
 
     def action_continue(self) -> None:
+        from .continue_watching import ContinueWatchingScreen
         self.app.push_screen(ContinueWatchingScreen(self.backend))
 
     def action_settings(self) -> None:
+        from .settings import SettingsScreen
         self.app.push_screen(SettingsScreen(self.backend))
+
+    def action_metrics(self) -> None:
+        from .metrics import MetricsScreen
+        self.app.push_screen(MetricsScreen(self.backend))
@@ -0,0 +1,64 @@
+from textual.screen import Screen
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.widgets import Static, Footer, Header, DataTable
+
+from ..backend.backend_v3 import AnimeBackend
+from ..backend.metrics_control import metrics
+
+class MetricsScreen(Screen):
+    """
+    Debug view of the span histograms and counters, refreshed every second.
+    """
+    CSS_PATH = "../css/metrics_styles.css"
+    BINDINGS = [
+        Binding("escape", "go_back", "Go Back"),
+        Binding("r", "reset_metrics", "Reset"),
+    ]
+
+    def __init__(self, backend: AnimeBackend, **kwargs):
+        super().__init__(**kwargs)
+        self.backend = backend
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=False)
+        yield Static("Timings", classes="title")
+        yield DataTable(id="timings", cursor_type="none", zebra_stripes=True)
+        yield Static("Counters", classes="title")
+        yield DataTable(id="counters", cursor_type="none", zebra_stripes=True)
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.query_one("#timings", DataTable).add_columns("span", "count", "p50 ms", "p95 ms", "max ms")
+        self.query_one("#counters", DataTable).add_columns("counter", "value")
+        self.refresh_metrics()
+        self.set_interval(1.0, self.refresh_metrics)
+
+    @staticmethod
+    def _ms(seconds) -> str:
+        return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+    def refresh_metrics(self) -> None:
+        snapshot = metrics.snapshot()
+
+        timings = self.query_one("#timings", DataTable)
+        timings.clear()
+        for name, h in sorted(snapshot["histograms"].items()):
+            timings.add_row(name, str(h["count"]), self._ms(h["p50"]), self._ms(h["p95"]), self._ms(h["max"]))
+
+        # Only show the last launch if a player exists, don't build one just for this
+        last_launch = self.backend.player.timings if "player" in vars(self.backend) else {}
+        for name, seconds in last_launch.items():
+            timings.add_row(f"mpv.last.{name}", "1", self._ms(seconds), "", "")
+
+        counters = self.query_one("#counters", DataTable)
+        counters.clear()
+        for name, value in sorted(snapshot["counters"].items()):
+            counters.add_row(name, str(value))
+
+    def action_reset_metrics(self) -> None:
+        metrics.reset()
+        self.refresh_metrics()
+
+    def action_go_back(self) -> None:
+        self.app.pop_screen()
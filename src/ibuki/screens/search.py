@@ -1,8 +1,12 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from textual import work
 from textual.screen import Screen
+from textual.worker import get_current_worker
 from textual.widgets import Input, ListView, ListItem, Static, Footer
 from textual.app import ComposeResult
-from ..backend.backend_v3 import AnimeBackend as backend
-from ..backend.utils_v3 import clean_html
+from ..backend.backend_v3 import AnimeBackend
 from .anime_detail import AnimeDetailScreen
 from .episode_view import EpisodeDetailScreen
 
@@ -12,6 +16,15 @@ class SearchScreen(Screen):
         ('s', 'synopsis', 'Synopsis')
     ]
     CSS_PATH = '../css/search_styles.css'
+    INFO_WORKERS = 6
+    DEBOUNCE = 0.35
+    POLL = 0.05
+    MIN_QUERY = 2
+
+    def __init__(self, backend: AnimeBackend, **kwargs):
+        super().__init__(**kwargs)
+        self.backend = backend
+        self._search_generation = 0
 
     def compose(self) -> ComposeResult:
         yield Input(placeholder='Search for anime :3', id='search_input')
@@ -19,47 +32,152 @@ class SearchScreen(Screen):
         yield Static('', id='synopsis_display')
         yield Footer()
 
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Search as you type: local hits right away, the provider once typing pauses."""
+        self._start_search(event.value.strip(), delay=self.DEBOUNCE)
+
     def on_input_submitted(self, event: Input.Submitted) -> None:
         query = event.input.value.strip()
+        self._start_search(query, delay=0)
+        if not query:
+            self.query_one('#search_results', ListView).append(ListItem(Static('Anime not found! :/')))
+
+    def _start_search(self, query: str, delay: float) -> None:
+        """
+        Supersede whatever search is pending or running and start a new one
+        in a worker, so nothing on the keystroke path touches the backend.
+        """
+        self._search_generation += 1
+        generation = self._search_generation
+        self.workers.cancel_group(self, 'search')
+
+        if not query or (delay and len(query) < self.MIN_QUERY):
+            self.query_one('#search_results', ListView).clear()
+            return
+
+        self.run_search(query, generation, delay)
+
+    @work(thread=True, exclusive=True, group='search')
+    def run_search(self, query: str, generation: int, delay: float = 0) -> None:
+        """
+        Show matching titles we already know, wait delay seconds for typing to
+        pause, then ask the provider and merge new titles in under the local
+        hits. Synopses fill in from a bounded pool as each info arrives, which
+        also warms the backend's info cache for the details screen.
+        A newer search cancels this one.
+        """
+        worker = get_current_worker()
+        local = self.backend.search_local(query)
+        if worker.is_cancelled:
+            return
+        self.app.call_from_thread(self._show_results, local, generation, True)
+
+        waited = 0.0
+        while waited < delay:
+            time.sleep(self.POLL)
+            waited += self.POLL
+            if worker.is_cancelled:
+                return
+
+        anime_list = self.backend.get_anime_by_query(query)
+        if worker.is_cancelled:
+            return
+
+        shown = {getattr(anime, 'identifier', id(anime)) for anime in local}
+        new = [anime for anime in anime_list if getattr(anime, 'identifier', id(anime)) not in shown]
+        merged = local + new
+        suggestions = [] if merged else self.backend.suggest_titles(query)
+        self.app.call_from_thread(self._add_results, new, generation, suggestions)
+
+        if not merged:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self.INFO_WORKERS)
+        try:
+            futures = {pool.submit(self.backend.get_anime_info, anime): anime for anime in merged}
+            for future in as_completed(futures):
+                if worker.is_cancelled:
+                    break
+
+                info = future.result()
+                synopsis = info.synopsis if info else 'Not available :('
+
+                self.app.call_from_thread(self._set_synopsis, futures[future], synopsis, generation)
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _show_results(self, anime_list, generation: int, pending: bool = False) -> None:
+        if generation != self._search_generation:
+            return
+
         list_view = self.query_one('#search_results', ListView)
         list_view.clear()
 
-        if not query:
-            list_view.append(ListItem(Static('Anime not found! :/')))
+        if not anime_list:
+            list_view.append(ListItem(Static('Searching... :3' if pending else 'Anime not found! :/')))
             return
 
-        anime_list = backend().get_anime_by_query(query)
-        if not anime_list:
-            list_view.append(ListItem(Static('Anime not found! :/')))
+        self._append_results(list_view, anime_list)
+
+    def _add_results(self, anime_list, generation: int, suggestions=()) -> None:
+        """
+        Provider results arrived: drop the placeholder and append what is new.
+        Nothing at all found offers "did you mean" titles from the local index.
+        """
+        if generation != self._search_generation:
             return
 
-        for idx, anime in enumerate(anime_list):
-            if anime is not None and hasattr(anime, 'get_info'):
-                info = anime.get_info()
-            else:
-                list_view.append(ListItem(Static('Anime not found! :/')))
-                return
+        list_view = self.query_one('#search_results', ListView)
+        for child in list(list_view.children):
+            if getattr(child, 'anime', None) is None:
+                child.remove()
 
-            title = info.name
-            synopsis = clean_html(info.synopsis)
-            item_widget = Static(title)
+        has_results = any(getattr(child, 'anime', None) is not None for child in list_view.children)
+        if not anime_list and not has_results:
+            list_view.append(ListItem(Static('Anime not found! :/')))
+            for title in suggestions:
+                list_item = ListItem(Static(f'Did you mean: {title}?'))
+                list_item.suggestion = title
+                list_view.append(list_item)
+            return
 
-            list_item = ListItem(item_widget)
-            list_item.index = idx
-            list_item.synopsis = synopsis
+        self._append_results(list_view, anime_list)
+
+    @staticmethod
+    def _append_results(list_view: ListView, anime_list) -> None:
+        for anime in anime_list:
+            list_item = ListItem(Static(anime.name))
+            list_item.synopsis = None
             list_item.anime = anime
             list_view.append(list_item)
 
+    def _set_synopsis(self, anime, synopsis: str, generation: int) -> None:
+        if generation != self._search_generation:
+            return
+
+        for child in self.query_one('#search_results', ListView).children:
+            if getattr(child, 'anime', None) is anime:
+                child.synopsis = synopsis
+                break
+
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle when user clicks or presses enter on a list item"""
         selected_item = event.item
         anime = getattr(selected_item, 'anime', None)
 
+        suggestion = getattr(selected_item, 'suggestion', None)
+        if suggestion:
+            search_input = self.query_one('#search_input', Input)
+            search_input.value = suggestion
+            search_input.focus()
+            return
+
         if anime is None:
             print("[Error] Selected item has no anime data attached :(")
             return
 
-        self.app.push_screen(EpisodeDetailScreen(anime))
+        self.app.push_screen(EpisodeDetailScreen(anime, self.backend))
 
     def action_synopsis(self):
         list_view = self.query_one('#search_results', ListView)
@@ -75,12 +193,11 @@ class SearchScreen(Screen):
 
         selected = children[selected_index]
         anime = getattr(selected, 'anime', None)
-        synopsis = getattr(selected, 'synopsis', 'No synopsis available.')
 
         if anime:
-            self.app.push_screen(AnimeDetailScreen(anime, synopsis))
+            self.app.push_screen(AnimeDetailScreen(anime, self.backend))
         else:
             print('[Error] Selected item has no anime data attached :/')
 
     def action_go_back(self):
-        self.app.pop_screen()
\ No newline at end of file
+        self.app.pop_screen()
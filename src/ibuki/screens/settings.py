@@ -20,6 +20,7 @@ class SettingsScreen(Screen):
         super().__init__()
         self.backend = backend
         self.settings = backend.settings
+        self.settings.reload_if_changed()
         self.modified = False
 
     def compose(self) -> ComposeResult:
@@ -146,7 +147,6 @@ class SettingsScreen(Screen):
             updates["minimal_progress_threshold"] = max(0.0, min(100.0, threshold)) / 100.0
 
             self.settings.update_multiple(updates)
-            self.backend.global_quality = updates["quality"]
 
             self.modified = False
             self._show_status("✓ Settings saved", "success")
@@ -161,7 +161,6 @@ class SettingsScreen(Screen):
         """Reset all settings to defaults"""
         try:
             self.settings.reset()
-            self.backend.global_quality = self.settings.get("quality", 1080)
 
             self.app.pop_screen()
             self.app.push_screen(SettingsScreen(self.backend))
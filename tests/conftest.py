@@ -0,0 +1,81 @@
+import os
+import statistics
+
+import pytest
+
+from ibuki.backend.backend_v3 import AnimeBackend
+from ibuki.backend.cache_control import SearchCache, EpisodeCache, AnimeIndex, InfoCache, StreamCache
+from ibuki.backend.settings_control import AnimeSettings
+from ibuki.backend.utils_v3 import WatchHistory
+
+from .fake_mpv import fake_mpv_bin
+from .fakes import FakeAllAnimeProvider
+
+# Shared fixtures: a backend kept inside tmp_path, the fake mpv on PATH and the benchmark recorder
+
+_benchmarks = {}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: latency benchmark against the fake provider and mpv")
+
+
+@pytest.fixture
+def make_backend(tmp_path):
+    """
+    make_backend() -> AnimeBackend on the fake provider whose settings, caches
+    and history all live in tmp_path, so nothing touches ~/Project-Ibuki.
+    Backends made in the same test share those files.
+    """
+    def _make():
+        backend = AnimeBackend(settings=AnimeSettings(config_path=tmp_path / "settings.yaml"))
+        backend.provider = FakeAllAnimeProvider()
+        backend.search_cache = SearchCache(db_path=tmp_path / "search.db")
+        backend.episode_cache = EpisodeCache(db_path=tmp_path / "episodes.db")
+        backend.anime_index = AnimeIndex(db_path=tmp_path / "anime_index.db")
+        backend.info_cache = InfoCache(db_path=tmp_path / "info.db")
+        backend.stream_cache = StreamCache()
+        backend.watch_history = WatchHistory(file_path=tmp_path / "progress.json")
+        return backend
+    return _make
+
+
+@pytest.fixture
+def backend(make_backend):
+    return make_backend()
+
+
+@pytest.fixture
+def fake_mpv(tmp_path, monkeypatch):
+    """Make `mpv` resolve to tests/fake_mpv.py for this test."""
+    binary = fake_mpv_bin(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{binary.parent}{os.pathsep}{os.environ.get('PATH', '')}")
+    return binary
+
+
+@pytest.fixture
+def record_latency():
+    """record_latency(name, seconds) adds a sample to the end-of-run benchmark report."""
+    def _record(name, seconds):
+        _benchmarks.setdefault(name, []).append(seconds)
+    return _record
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))]
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _benchmarks:
+        return
+
+    terminalreporter.section("ibuki latency benchmarks")
+    terminalreporter.write_line(f"{'operation':<32}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name, samples in sorted(_benchmarks.items()):
+        terminalreporter.write_line(
+            f"{name:<32}{len(samples):>5}"
+            f"{percentile(samples, 50) * 1000:>10.2f}"
+            f"{percentile(samples, 95) * 1000:>10.2f}"
+            f"{statistics.fmean(samples) * 1000:>10.2f}"
+        )
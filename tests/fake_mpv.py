@@ -0,0 +1,204 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# A tiny mpv that only speaks the JSON IPC protocol, no video involved.
+# Used in-process (FakeMPV(...).start()) or as the `mpv` binary through fake_mpv_bin().
+
+
+class FakeMPV:
+    """
+    Unix-socket server answering the subset of mpv's IPC that MPVControl uses:
+    observe_property, get_property, set_property, loadfile, quit and
+    script-message ("eof" / "error" end the current file like a real one would).
+    """
+
+    def __init__(self, sock_path, url=None, start=0.0, duration=1440.0, load_delay=0.0, idle=False):
+        self.sock_path = str(sock_path)
+        self.url = url
+        self.duration = duration
+        self.load_delay = load_delay
+        self.idle = idle
+        self.properties = {
+            "time-pos": None,
+            "duration": None,
+            "pause": False,
+            "paused-for-cache": False,
+            "eof-reached": False,
+            "start": str(start),
+        }
+        self.commands = []
+        self.done = threading.Event()
+        self._clients = []
+        self._observers = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        """Listen on sock_path and serve from a background thread."""
+        Path(self.sock_path).unlink(missing_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.sock_path)
+        self._server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.done.set()
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except OSError:
+                pass
+        if self._server:
+            self._server.close()
+        Path(self.sock_path).unlink(missing_ok=True)
+
+    def _accept(self):
+        while not self.done.is_set():
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            with self._lock:
+                first = not self._clients
+                self._clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+            if first and self.url and self.properties["duration"] is None:
+                # The file "opens" once someone is listening, so playback-restart is never missed
+                threading.Thread(target=self._load, args=(self.url,), daemon=True).start()
+
+    def _send(self, client, msg):
+        try:
+            with self._lock:
+                client.sendall(json.dumps(msg).encode() + b"\n")
+        except OSError:
+            pass
+
+    def _broadcast(self, msg):
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            self._send(client, msg)
+
+    def _set(self, name, value):
+        self.properties[name] = value
+        for (client, observer_id), observed in list(self._observers.items()):
+            if observed == name:
+                self._send(client, {"event": "property-change", "id": observer_id, "name": name, "data": value})
+
+    def _load(self, url):
+        self._broadcast({"event": "start-file"})
+        if self.load_delay:
+            time.sleep(self.load_delay)
+        self.url = url
+        self._broadcast({"event": "file-loaded"})
+        self._set("duration", self.duration)
+        self._set("time-pos", float(self.properties["start"] or 0))
+        self._broadcast({"event": "playback-restart"})
+
+    def _end_file(self, reason):
+        self._set("time-pos", None)
+        self._broadcast({"event": "end-file", "reason": reason})
+        if reason == "quit" or not self.idle:
+            self.stop()
+
+    def _serve(self, client):
+        buffer = b""
+        while not self.done.is_set():
+            try:
+                data = client.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    self._handle(client, json.loads(line))
+
+    def _handle(self, client, msg):
+        command, *args = msg["command"]
+        self.commands.append([command, *args])
+        reply = {"request_id": msg.get("request_id", 0), "error": "success", "data": None}
+
+        if command == "observe_property":
+            self._observers[(client, args[0])] = args[1]
+            self._send(client, reply)
+            if self.properties.get(args[1]) is not None:
+                self._send(client, {"event": "property-change", "id": args[0],
+                                    "name": args[1], "data": self.properties[args[1]]})
+            return
+
+        if command == "get_property":
+            if args[0] in self.properties:
+                reply["data"] = self.properties[args[0]]
+            else:
+                reply["error"] = "property not found"
+
+        elif command == "set_property":
+            self._set(args[0], args[1])
+
+        elif command == "loadfile":
+            if self.url:
+                self._broadcast({"event": "end-file", "reason": "stop"})
+            threading.Thread(target=self._load, args=(args[0],), daemon=True).start()
+
+        elif command == "script-message" and args and args[0] in ("eof", "error"):
+            self._send(client, reply)
+            self._end_file(args[0])
+            return
+
+        elif command == "quit":
+            self._send(client, reply)
+            self._end_file("quit")
+            return
+
+        self._send(client, reply)
+
+
+def fake_mpv_bin(directory) -> Path:
+    """
+    Write an executable named mpv into directory that runs this module,
+    put directory first on PATH and MPVControl launches the fake.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    binary = directory / "mpv"
+    binary.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{Path(__file__).resolve()}" "$@"\n')
+    binary.chmod(0o755)
+    return binary
+
+
+def main(argv):
+    options = {}
+    url = None
+    for arg in argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value
+        elif not arg.startswith("-"):
+            url = url or arg
+
+    mpv = FakeMPV(
+        options["input-ipc-server"],
+        url=url,
+        start=float(options.get("start", 0) or 0),
+        duration=float(os.environ.get("IBUKI_FAKE_MPV_DURATION", 1440)),
+        load_delay=float(os.environ.get("IBUKI_FAKE_MPV_LOAD_DELAY", 0)),
+        idle=options.get("idle") == "yes",
+    ).start()
+    mpv.done.wait()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
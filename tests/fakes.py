@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+
+import requests
+
+from anipy_api.provider import (
+    LanguageTypeEnum,
+    ProviderInfoResult,
+    ProviderSearchResult,
+    ProviderStream,
+)
+
+# Deterministic stand-in for AllAnimeProvider, shared by the backend tests and benchmarks
+
+
+class FakeAllAnimeProvider:
+    """
+    Same methods and NAME as AllAnimeProvider, no network.
+    Every call sleeps latency +/- jitter seconds and fails with a retryable
+    ConnectionError at failure_rate; both come from a seeded RNG, so a given
+    seed always produces the same sequence of delays and failures.
+    """
+
+    NAME = "allanime"
+    BASE_URL = "https://fake.allanime.invalid"
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            failure_rate: float = 0.0,
+            seed: int = 0,
+            catalog: int = 20,
+            episodes: int = 12,
+            resolutions=(480, 720, 1080)
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.episodes = episodes
+        self.resolutions = list(resolutions)
+        self.session = requests.Session()
+        self.calls = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.catalog = {
+            f"fake{i}": f"Fake Anime {i}" for i in range(catalog)
+        }
+
+    def _simulate(self, method: str):
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.failure_rate
+
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise requests.ConnectionError(f"fake {method} failure")
+
+    def get_search(self, query: str):
+        self._simulate("get_search")
+        words = query.lower().split()
+        return [
+            ProviderSearchResult(
+                identifier=identifier,
+                name=name,
+                languages={LanguageTypeEnum.SUB, LanguageTypeEnum.DUB}
+            )
+            for identifier, name in self.catalog.items()
+            if all(word in name.lower() for word in words)
+        ]
+
+    def get_info(self, identifier: str):
+        self._simulate("get_info")
+        return ProviderInfoResult(
+            name=self.catalog.get(identifier, identifier),
+            genres=["Action"],
+            synopsis=f"<p>Synopsis of {identifier}</p>",
+            release_year=2024,
+        )
+
+    def get_episodes(self, identifier: str, lang: LanguageTypeEnum):
+        self._simulate("get_episodes")
+        return list(range(1, self.episodes + 1))
+
+    def get_video(self, identifier: str, episode, lang: LanguageTypeEnum):
+        self._simulate("get_video")
+        return [
+            ProviderStream(
+                url=f"https://cdn.fake.invalid/{identifier}/{episode}/{resolution}.m3u8",
+                resolution=resolution,
+                episode=episode,
+                language=lang,
+            )
+            for resolution in self.resolutions
+        ]
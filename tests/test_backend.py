@@ -1,11 +1,14 @@
+import time
 import pytest
 from unittest.mock import MagicMock, patch
 from pathlib import Path
-from ibuki.backend.backend_v3 import AnimeBackend
 from ibuki.backend.utils_v3 import WatchHistory, clean_html
-from ibuki.backend.mpv_control import MPVPlayer
+from ibuki.backend.mpv_control import MPVControl
+from anipy_api.anime import Anime
 from anipy_api.provider import LanguageTypeEnum
 
+from .fakes import FakeAllAnimeProvider
+
 # Unit tests for utils_v3.py, backend_v3.py, and mpv_control.py
 
 
@@ -35,10 +38,8 @@ def test_watchhistory_update_progress(tmp_path):
 AnimeBackend Tests
 """
 
-@patch("ibuki.backend.backend_v3.AllAnimeProvider")
-@patch("ibuki.backend.backend_v3.MPVPlayer")
-def test_play_episode_calls_mpv(mock_mpv, mock_provider):
-    backend = AnimeBackend()
+@patch("ibuki.backend.backend_v3.MPVControl")
+def test_play_episode_calls_mpv(mock_mpv, backend):
     anime = MagicMock()
     stream = MagicMock()
     stream.url = "http://example.com"
@@ -49,62 +50,44 @@ def test_play_episode_calls_mpv(mock_mpv, mock_provider):
     assert backend.current_anime == anime
     assert backend.current_episode == 1
 
-def test_get_referrer_for_url():
-    backend = AnimeBackend()
+def test_get_referrer_for_url(backend):
     assert backend.get_referrer_for_url("https://fast4speed.xyz") == "https://allanime.day"
     assert backend.get_referrer_for_url("https://sunshinerays.xyz") == "https://allmanga.to"
     assert backend.get_referrer_for_url("https://unknown.xyz") == "https://allanime.day"
 
 
-@patch("ibuki.backend.backend_v3.AllAnimeProvider")
-def test_get_anime_by_query_caching(mock_provider_class):
-    mock_provider = mock_provider_class.return_value
-    mock_result = MagicMock()
-    mock_result.id = "123"
-    mock_provider.get_search.return_value = [mock_result]
-
-    backend = AnimeBackend()
-    backend.provider = mock_provider
+def test_get_anime_by_query_caching(backend):
+    backend.provider = FakeAllAnimeProvider(catalog=3)
 
-    anime_list = backend.get_anime_by_query("test")
+    anime_list = backend.get_anime_by_query("fake anime 1")
     assert len(anime_list) == 1
-    cached = backend.get_anime_by_query("test")
+    cached = backend.get_anime_by_query("fake anime 1")
     assert cached[0] is anime_list[0]
+    assert backend.provider.calls["get_search"] == 1
 
 
-def test_choose_stream_logic():
-    backend = AnimeBackend()
-    # Create mock streams with resolutions
-    streams = [MagicMock(resolution=r) for r in [480, 720, 1080]]
-
-    # Exact match
-    s = backend._choose_stream(streams, 720)
-    assert s.resolution == 720
+def test_episode_stream_quality_choice(backend):
+    # Quality is picked by anipy's Anime.get_video: exact match, else the best stream
+    anime = Anime(FakeAllAnimeProvider(resolutions=(480, 720, 1080)), "Fake Anime 0", "fake0", set())
 
-    # Lower resolution fallback
-    s = backend._choose_stream(streams, 800)
-    assert s.resolution == 720
+    assert backend.get_episode_stream(anime, 1, 720).resolution == 720
+    assert backend.get_episode_stream(anime, 2, 800).resolution == 1080
+    assert backend.get_episode_stream(anime, 3, 2000).resolution == 1080
 
-    # Highest available
-    s = backend._choose_stream(streams, 2000)
-    assert s.resolution == 1080
-
-    # Empty streams
-    s = backend._choose_stream([], 720)
-    assert s is None
+    empty = Anime(FakeAllAnimeProvider(resolutions=()), "Fake Anime 1", "fake1", set())
+    assert backend.get_episode_stream(empty, 1, 720) is None
 
 @patch("ibuki.backend.backend_v3.AnimeBackend.get_anime_by_query")
 @patch("ibuki.backend.backend_v3.AnimeBackend.get_episode_stream")
 @patch("ibuki.backend.backend_v3.AnimeBackend.play_episode")
-def test_resume_anime(mock_play, mock_get_stream, mock_get_query):
-    backend = AnimeBackend()
+def test_resume_anime(mock_play, mock_get_stream, mock_get_query, backend):
 
     # Fake watch history entry
     backend.watch_history.update_progress("anime1", "Test Anime", 1, 50, 100)
     entry = backend.watch_history.get_entry("anime1")
 
     mock_get_stream.return_value = MagicMock(url="http://example.com")
-    mock_get_query.return_value = [MagicMock()]
+    mock_get_query.return_value = [MagicMock(identifier="anime1")]
 
     result = backend.resume_anime("anime1", quality=720)
     assert result is True
@@ -114,24 +97,21 @@ def test_resume_anime(mock_play, mock_get_stream, mock_get_query):
     result = backend.resume_anime("missing_anime")
     assert result is False
 
-@patch("ibuki.backend.mpv_player.socket.socket")
-@patch("ibuki.backend.mpv_player.subprocess.Popen")
-@patch("ibuki.backend.mpv_player.Path.exists", return_value=True)
-def test_mpv_launch_process(mock_exists, mock_popen, mock_socket):
-    mock_proc = MagicMock()
-    mock_proc.poll.return_value = None
-    mock_popen.return_value = mock_proc
+def test_mpv_launch_process(fake_mpv, tmp_path):
+    mpv = MPVControl(sock_path=str(tmp_path / "mpv.sock"))
+    assert mpv.launch("http://example.com", start_time=5) is True
+    assert mpv.running is True
+    assert mpv.timings["launch_to_connected"] is not None
 
-    mock_sock_instance = MagicMock()
-    mock_socket.return_value = mock_sock_instance
+    deadline = time.monotonic() + 2
+    while mpv.get_current_state() != (5.0, 1440.0) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert mpv.get_elapsed_time() == 5
 
-    mpv = MPVPlayer(sock_path="/tmp/test.sock")
-    mpv._cleanup_socket = MagicMock()
-    mpv.launch("http://example.com")
-    assert mpv.running is True
-    mpv._cleanup_socket.assert_called()
+    mpv.close()
+    assert not (tmp_path / "mpv.sock").exists()
 
 def test_mpv_get_elapsed_time_none(monkeypatch):
-    mpv = MPVPlayer()
+    mpv = MPVControl()
     monkeypatch.setattr(mpv, "get_current_state", lambda: (None, None))
     assert mpv.get_elapsed_time() == 0
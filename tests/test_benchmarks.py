@@ -0,0 +1,126 @@
+import time
+
+import pytest
+from anipy_api.anime import Anime
+
+from ibuki.backend.mpv_control import MPVControl
+from ibuki.backend.provider_control import ProviderAdapter
+from ibuki.backend.utils_v3 import WatchHistory, SQLiteWatchHistory
+
+from .conftest import percentile
+from .fakes import FakeAllAnimeProvider
+
+# End-to-end latency of the backend against the fake provider and fake mpv.
+# p50/p95 end up in the "ibuki latency benchmarks" section of the pytest report,
+# the budgets are loose enough for a slow CI box and only catch real regressions.
+
+pytestmark = pytest.mark.benchmark
+
+LATENCY = 0.01
+JITTER = 0.005
+ROUNDS = 20
+
+
+def _provider(**options) -> ProviderAdapter:
+    provider = FakeAllAnimeProvider(latency=LATENCY, jitter=JITTER, **options)
+    return ProviderAdapter(provider, backoff_base=0.005)
+
+
+@pytest.fixture
+def backend(backend):
+    """The shared tmp_path backend on a slow, jittery fake provider."""
+    backend.provider = _provider()
+    backend.auto_next_episode = False
+    backend.skip_intro_seconds = 0
+    backend.fullscreen = False
+    return backend
+
+
+def _timed(record_latency, name, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    record_latency(name, elapsed)
+    return result, elapsed
+
+
+def _assert_p95(samples, budget):
+    assert percentile(samples, 95) < budget, f"p95 {percentile(samples, 95):.3f}s over {budget}s budget"
+
+
+def test_search_latency(backend, record_latency):
+    cold, warm = [], []
+    for i in range(ROUNDS):
+        results, elapsed = _timed(record_latency, "get_anime_by_query", backend.get_anime_by_query, f"anime {i}")
+        assert results[0].name == f"Fake Anime {i}"
+        cold.append(elapsed)
+
+        _, elapsed = _timed(record_latency, "get_anime_by_query (cached)", backend.get_anime_by_query, f"anime {i}")
+        warm.append(elapsed)
+
+    assert backend.provider.provider.calls["get_search"] == ROUNDS
+    _assert_p95(cold, LATENCY + JITTER + 0.1)
+    _assert_p95(warm, 0.05)
+
+
+def test_episodes_and_stream_latency(backend, record_latency):
+    backend.provider = _provider(failure_rate=0.05, seed=7)
+    episodes_samples, stream_samples = [], []
+    for identifier, name in list(backend.provider.provider.catalog.items())[:ROUNDS]:
+        anime = Anime(backend.provider, name, identifier, set())
+
+        episodes, elapsed = _timed(record_latency, "get_episodes", backend.get_episodes, anime)
+        assert episodes == list(range(1, 13))
+        episodes_samples.append(elapsed)
+
+        stream, elapsed = _timed(record_latency, "get_episode_stream", backend.get_episode_stream, anime, 1, 720)
+        assert stream.resolution == 720
+        stream_samples.append(elapsed)
+
+    _assert_p95(episodes_samples, LATENCY + JITTER + 0.2)
+    _assert_p95(stream_samples, LATENCY + JITTER + 0.2)
+
+
+def test_play_episode_latency(backend, tmp_path, record_latency, fake_mpv):
+    anime = Anime(backend.provider, "Fake Anime 0", "fake0", set())
+    stream = backend.get_episode_stream(anime, 1, 1080)
+    samples = []
+
+    for _ in range(5):
+        backend.player = MPVControl(sock_path=str(tmp_path / "mpv.sock"))
+        _, elapsed = _timed(record_latency, "play_episode (launch)", backend.play_episode, anime, 1, stream)
+        samples.append(elapsed)
+        assert backend.player.running
+
+        deadline = time.monotonic() + 2
+        while backend.player.timings["launch_to_first_frame"] is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        record_latency("mpv launch_to_first_frame", backend.player.timings["launch_to_first_frame"])
+
+        backend.player.quit()
+        deadline = time.monotonic() + 2
+        while backend.player.running and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert not backend.player.running
+        backend.player.close()
+
+    _assert_p95(samples, 2.0)
+
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+def test_update_progress_latency(tmp_path, record_latency, engine):
+    if engine == "json":
+        history = WatchHistory(file_path=tmp_path / "progress.json")
+    else:
+        history = SQLiteWatchHistory(db_path=tmp_path / "history.db", migrate_from=tmp_path / "progress.json")
+
+    samples = []
+    for i in range(200):
+        _, elapsed = _timed(
+            record_latency, f"update_progress ({engine})",
+            history.update_progress, f"anime{i % 25}", f"Anime {i % 25}", i // 25 + 1, i, 1440
+        )
+        samples.append(elapsed)
+    history.close()
+
+    _assert_p95(samples, 0.05)
@@ -0,0 +1,165 @@
+import time
+from unittest.mock import MagicMock
+
+from anipy_api.provider import ProviderInfoResult
+from anipy_api.provider.base import Status
+
+from ibuki.backend.cache_control import DiskCache, SearchCache, StreamCache, EpisodeCache, InfoCache
+
+# Unit tests for cache_control.py
+
+"""
+DiskCache Tests
+"""
+def test_diskcache_roundtrip(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db")
+    cache.set("a", {"x": 1}, ttl=60)
+    assert cache.get("a") == {"x": 1}
+    assert cache.get("missing") is None
+
+def test_diskcache_expiry(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db")
+    cache.set("a", [1, 2], ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+def test_diskcache_lru_eviction(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db", max_bytes=30)
+    cache.set("a", "x" * 10, ttl=60)
+    cache.set("b", "y" * 10, ttl=60)
+    cache.get("a")
+    cache.set("c", "z" * 10, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
+    assert cache.total_bytes() <= 30
+
+def test_diskcache_uses_wal(tmp_path):
+    cache = DiskCache(tmp_path / "cache.db")
+    assert cache.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert cache.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+def test_diskcache_persists(tmp_path):
+    DiskCache(tmp_path / "cache.db").set("a", 1, ttl=60)
+    assert DiskCache(tmp_path / "cache.db").get("a") == 1
+
+"""
+SearchCache Tests
+"""
+def test_searchcache_normalizes_query(tmp_path):
+    cache = SearchCache(db_path=tmp_path / "search.db")
+    cache.set("  Frieren   Beyond ", [{"identifier": "1", "name": "Frieren", "languages": ["sub"]}])
+    assert cache.get("frieren beyond")[0]["identifier"] == "1"
+
+def test_searchcache_empty_results_short_ttl(tmp_path):
+    cache = SearchCache(db_path=tmp_path / "search.db", empty_ttl=0.01)
+    cache.set("nothing", [])
+    assert cache.get("nothing") == []
+    time.sleep(0.02)
+    assert cache.get("nothing") is None
+
+def test_backend_search_skips_provider_on_repeat(backend):
+    from anipy_api.provider import ProviderSearchResult, LanguageTypeEnum
+
+    backend.provider = MagicMock()
+    backend.provider.get_search.return_value = [
+        ProviderSearchResult(identifier="abc", name="Test Anime", languages={LanguageTypeEnum.SUB})
+    ]
+
+    first = backend.get_anime_by_query("Test")
+    second = backend.get_anime_by_query("test ")
+    assert backend.provider.get_search.call_count == 1
+    assert second[0] is first[0]
+    assert second[0].identifier == "abc"
+
+"""
+StreamCache Tests
+"""
+def test_streamcache_reads_signed_url_expiry():
+    now = 1_700_000_000
+    assert StreamCache.url_lifetime(f"https://cdn.example/v.m3u8?token=x&expires={now + 120}", now=now) == 120
+    assert StreamCache.url_lifetime(
+        "https://s3.example/v.mp4?X-Amz-Date=20231114T221320Z&X-Amz-Expires=300", now=now
+    ) == 300
+    assert StreamCache.url_lifetime("https://cdn.example/v.m3u8?quality=1080", now=now) is None
+
+def test_streamcache_respects_url_lifetime():
+    cache = StreamCache(default_ttl=600, margin=30)
+    expiring = MagicMock(url=f"https://cdn.example/v.m3u8?exp={int(time.time()) + 10}")
+    fresh = MagicMock(url=f"https://cdn.example/v.m3u8?exp={int(time.time()) + 3600}")
+
+    cache.put(("a", 1, 1080, "sub"), expiring)
+    cache.put(("a", 2, 1080, "sub"), fresh)
+    assert cache.get(("a", 1, 1080, "sub")) is None
+    assert cache.get(("a", 2, 1080, "sub")) is fresh
+
+def test_streamcache_invalidate_url():
+    cache = StreamCache()
+    stream = MagicMock(url="https://cdn.example/broken.m3u8")
+    cache.put(("a", 1, 1080, "sub"), stream)
+    cache.invalidate_url("https://cdn.example/broken.m3u8")
+    assert ("a", 1, 1080, "sub") not in cache
+
+"""
+EpisodeCache Tests
+"""
+def test_episodecache_freshness(tmp_path):
+    cache = EpisodeCache(db_path=tmp_path / "episodes.db", fresh_for=0.01)
+    assert cache.get("allanime:1") is None
+
+    cache.set("allanime:1", [1, 2, 3])
+    assert cache.get("allanime:1") == ([1, 2, 3], True)
+    time.sleep(0.02)
+    assert cache.get("allanime:1") == ([1, 2, 3], False)
+
+def test_backend_refresh_merges_new_episodes(backend, tmp_path):
+    backend.episode_cache = EpisodeCache(db_path=tmp_path / "episodes.db", fresh_for=0)
+    anime = MagicMock(identifier="abc")
+    anime.provider.NAME = "allanime"
+    backend.episode_cache.set("allanime:abc", [1, 2])
+
+    assert backend.get_cached_episodes(anime) == ([1, 2], False)
+    anime.get_episodes.return_value = [1, 2, 3]
+    assert backend.refresh_episodes(anime) == [1, 2, 3]
+
+    anime.get_episodes.side_effect = Exception("provider down")
+    backend.episodes_cache.clear()
+    assert backend.get_episodes(anime) == [1, 2, 3]
+
+def test_backend_memory_episodes_go_stale(backend, tmp_path):
+    backend.episode_cache = EpisodeCache(db_path=tmp_path / "episodes.db", fresh_for=0.05)
+    anime = MagicMock(identifier="abc")
+    anime.provider.NAME = "allanime"
+    anime.get_episodes.return_value = [1, 2]
+
+    backend.refresh_episodes(anime)
+    assert backend.get_cached_episodes(anime) == ([1, 2], True)
+    time.sleep(0.06)
+    # Still served from memory, but the screen should revalidate it
+    assert backend.get_cached_episodes(anime) == ([1, 2], False)
+
+"""
+InfoCache Tests
+"""
+def test_infocache_roundtrip_from_disk(tmp_path):
+    info = ProviderInfoResult(name="Frieren", genres=["Fantasy"], synopsis="Elf.", status=Status.COMPLETED)
+    InfoCache(db_path=tmp_path / "info.db").put("allanime:a", info)
+
+    cached = InfoCache(db_path=tmp_path / "info.db").get("allanime:a")
+    assert cached == info
+    assert cached.status is Status.COMPLETED
+
+def test_infocache_memory_lru(tmp_path):
+    cache = InfoCache(db_path=tmp_path / "info.db", max_entries=2)
+    for key in "abc":
+        cache.put(key, ProviderInfoResult(name=key))
+    assert list(cache._memory) == ["b", "c"]
+    # Evicted from memory, still on disk
+    assert cache.get("a").name == "a"
+    assert list(cache._memory) == ["c", "a"]
+
+def test_infocache_expiry(tmp_path):
+    cache = InfoCache(db_path=tmp_path / "info.db", ttl=0.01)
+    cache.put("a", ProviderInfoResult(name="a"))
+    time.sleep(0.02)
+    assert InfoCache(db_path=tmp_path / "info.db").get("a") is None
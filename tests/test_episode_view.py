@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from textual.app import App
+
+from ibuki.screens.episode_view import EpisodeDetailScreen, EpisodeList
+
+# Tests for the virtualized episode list, run headless through Textual's pilot
+
+
+def _open(episodes, watched=None, scenario=None):
+    backend = MagicMock()
+    backend.get_cached_episodes.return_value = (episodes, True)
+    backend.watch_history.get_entry.return_value = {"episode": watched, "timestamp": 40} if watched else None
+    anime = MagicMock()
+    anime.name = "Long Show"
+    anime.identifier = "long"
+    result = {}
+
+    async def run():
+        app = App()
+        async with app.run_test(size=(60, 24)) as pilot:
+            await app.push_screen(EpisodeDetailScreen(anime, backend))
+            await pilot.pause()
+            result["widgets"] = len(app.screen.query("*"))
+            if scenario:
+                await scenario(pilot, app.screen.query_one(EpisodeList))
+
+    asyncio.run(run())
+    return backend, result
+
+def test_widget_count_does_not_grow_with_episodes():
+    _, short = _open(list(range(1, 13)))
+    _, long = _open(list(range(1, 5001)))
+    assert short["widgets"] == long["widgets"]
+
+def test_opens_on_history_episode():
+    async def scenario(pilot, episode_list):
+        assert episode_list.episodes[episode_list.cursor] == 4200
+        assert episode_list.scroll_y <= episode_list.cursor < episode_list.scroll_y + episode_list.size.height
+
+    _open(list(range(1, 5001)), watched=4200, scenario=scenario)
+
+def test_page_down_and_jump():
+    async def scenario(pilot, episode_list):
+        page = episode_list.scrollable_content_region.height
+        await pilot.press("pagedown")
+        assert episode_list.cursor == page
+
+        await pilot.press("j", "7", "7", "7", "enter")
+        await pilot.pause()
+        assert episode_list.episodes[episode_list.cursor] == 777
+        assert episode_list.has_focus
+
+        await pilot.press("enter")
+        await pilot.pause()
+
+    backend, _ = _open(list(range(1, 1001)), scenario=scenario)
+    assert backend.play_episode.call_args[0][1] == 777
@@ -0,0 +1,102 @@
+import json
+
+from ibuki.backend.utils_v3 import WatchHistory, SQLiteWatchHistory
+
+# Unit tests for WatchHistory storage in utils_v3.py
+
+
+def test_journal_replayed_on_load(tmp_path):
+    file_path = tmp_path / "progress.json"
+    wh = WatchHistory(file_path=file_path)
+    wh.update_progress("anime1", "Test Anime", 1, 50, 100)
+    wh.update_progress("anime1", "Test Anime", 2, 10, 100)
+    wh.update_progress("anime2", "Other Anime", 3, 20, 100)
+    wh.remove_entry("anime2")
+    wh.close()
+
+    assert not file_path.exists()
+    reloaded = WatchHistory(file_path=file_path)
+    assert reloaded.get_entry("anime1")["episode"] == 2
+    assert reloaded.get_entry("anime2") is None
+
+def test_updates_are_batched(tmp_path):
+    file_path = tmp_path / "progress.json"
+    wh = WatchHistory(file_path=file_path, flush_every=3, flush_interval=3600)
+    wh.update_progress("a", "A", 1, 10, 100)
+    wh.update_progress("b", "B", 1, 10, 100)
+    assert not wh.journal_path.exists()
+
+    wh.update_progress("c", "C", 1, 10, 100)
+    assert len(wh.journal_path.read_text().splitlines()) == 3
+
+def test_torn_journal_record_is_skipped(tmp_path):
+    file_path = tmp_path / "progress.json"
+    wh = WatchHistory(file_path=file_path, flush_every=1)
+    wh.update_progress("a", "A", 1, 10, 100)
+    wh.close()
+    with open(wh.journal_path, "a") as f:
+        f.write('{"op":"set","id":"b","ent')
+
+    reloaded = WatchHistory(file_path=file_path)
+    assert reloaded.get_entry("a")["episode"] == 1
+    assert reloaded.get_entry("b") is None
+
+def test_compaction_writes_snapshot(tmp_path):
+    file_path = tmp_path / "progress.json"
+    wh = WatchHistory(file_path=file_path, flush_every=1, compact_after=5)
+    for i in range(12):
+        wh.update_progress(f"anime{i}", f"Anime {i}", 1, 10, 100)
+    wh.close()
+
+    snapshot = json.loads(file_path.read_text())
+    assert len(snapshot) >= 5
+    assert not wh.old_journal_path.exists()
+
+    reloaded = WatchHistory(file_path=file_path)
+    assert len(reloaded.history) == 12
+
+def test_save_compacts_everything(tmp_path):
+    file_path = tmp_path / "progress.json"
+    wh = WatchHistory(file_path=file_path)
+    wh.update_progress("a", "A", 1, 10, 100)
+    wh.save()
+
+    assert json.loads(file_path.read_text())["a"]["episode"] == 1
+    assert not wh.journal_path.exists()
+
+"""
+SQLiteWatchHistory Tests
+"""
+def test_sqlite_update_and_get(tmp_path):
+    wh = SQLiteWatchHistory(db_path=tmp_path / "history.db", migrate_from=None)
+    wh.update_progress("anime1", "Test Anime", 1, 50, 100)
+    entry = wh.get_entry("anime1")
+    assert entry["episode"] == 1
+    assert entry["progress_percent"] == 50.0
+    assert wh.get_entry("missing") is None
+
+def test_sqlite_continue_watching_order_and_filter(tmp_path):
+    wh = SQLiteWatchHistory(db_path=tmp_path / "history.db", migrate_from=None)
+    wh.update_progress("old", "Old", 1, 50, 100)
+    wh.update_progress("done", "Done", 1, 99, 100)
+    wh.update_progress("fresh", "Fresh", 1, 3, 100)
+    wh.update_progress("new", "New", 2, 40, 100)
+
+    cont = wh.get_continue_watching(limit=10)
+    assert [anime_id for anime_id, _ in cont] == ["new", "old"]
+    assert wh.get_continue_watching(limit=1)[0][0] == "new"
+
+def test_sqlite_migrates_json_once(tmp_path):
+    json_path = tmp_path / "progress.json"
+    legacy = WatchHistory(file_path=json_path)
+    legacy.update_progress("anime1", "Test Anime", 4, 50, 100)
+    legacy.close()
+
+    db_path = tmp_path / "history.db"
+    wh = SQLiteWatchHistory(db_path=db_path, migrate_from=json_path)
+    assert wh.get_entry("anime1")["episode"] == 4
+    wh.remove_entry("anime1")
+    wh.close()
+
+    wh = SQLiteWatchHistory(db_path=db_path, migrate_from=json_path)
+    assert wh.get_entry("anime1") is None
@@ -0,0 +1,46 @@
+import logging
+
+from ibuki.logs import logger as logs
+
+# Tests for the queue-based logging in logs/logger.py
+
+
+def test_records_written_by_background_thread(tmp_path):
+    log_path = logs.configure_logging(log_dir=tmp_path)
+    log = logging.getLogger("LoggerTest")
+    log.addHandler(logs._handler)
+    log.setLevel(logging.DEBUG)
+    try:
+        log.info("hello %s", "world")
+        logs.shutdown_logging()
+        assert "LoggerTest - hello world" in log_path.read_text()
+    finally:
+        log.removeHandler(logs._handler)
+        logs.configure_logging()
+
+def test_log_file_rotates_by_size(tmp_path):
+    log_path = logs.configure_logging(log_dir=tmp_path, max_bytes=200, backup_count=2)
+    log = logging.getLogger("RotateTest")
+    log.addHandler(logs._handler)
+    log.setLevel(logging.DEBUG)
+    try:
+        for i in range(50):
+            log.info("line %d padding padding padding", i)
+        logs.shutdown_logging()
+        assert (tmp_path / "logs.log.1").exists()
+        assert not (tmp_path / "logs.log.3").exists()
+        assert log_path.stat().st_size <= 200
+    finally:
+        log.removeHandler(logs._handler)
+        logs.configure_logging()
+
+def test_set_log_level_applies_to_our_loggers():
+    log = logs.get_logger("LevelTest")
+    logs._loggers.add("LevelTest")
+    logs.set_log_level("warning")
+    try:
+        assert log.level == logging.WARNING
+        logs.set_log_level("nonsense")
+        assert log.level == logging.WARNING
+    finally:
+        logs.set_log_level(logging.DEBUG)
@@ -0,0 +1,69 @@
+import json
+import logging
+
+import pytest
+
+from ibuki.backend.metrics_control import MetricsRegistry, LatencyHistogram, metrics
+
+# Unit tests for metrics_control.py
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram(window=100)
+    assert histogram.percentile(95) is None
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.percentile(50) == pytest.approx(0.050, abs=0.001)
+    assert histogram.percentile(95) == pytest.approx(0.095, abs=0.001)
+    assert histogram.percentile(100) == 0.1
+
+def test_span_logs_at_default_level():
+    registry = MetricsRegistry()
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    level = registry.logger.level
+    registry.logger.addHandler(handler)
+    registry.logger.setLevel(logging.INFO)
+    try:
+        with registry.span("op", episode=3):
+            pass
+    finally:
+        registry.logger.removeHandler(handler)
+        registry.logger.setLevel(level)
+
+    assert records[-1].levelno == logging.INFO
+    assert json.loads(records[-1].getMessage())["episode"] == 3
+
+def test_span_counts_calls_and_errors():
+    registry = MetricsRegistry()
+    with registry.span("work", query="frieren"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.span("work"):
+            raise ValueError("boom")
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"work.calls": 2, "work.errors": 1}
+    assert snapshot["histograms"]["work"]["count"] == 2
+
+def test_timed_decorator_keeps_return_value():
+    registry = MetricsRegistry()
+
+    @registry.timed("double")
+    def double(x):
+        return x * 2
+
+    assert double(4) == 8
+    assert registry.snapshot()["histograms"]["double"]["count"] == 1
+
+def test_backend_entry_points_are_timed(backend):
+    metrics.reset()
+
+    backend.get_anime_by_query("fake anime 1")
+    backend.get_anime_by_query("fake anime 1")
+
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["backend.get_anime_by_query"]["count"] == 2
+    assert snapshot["counters"]["search_cache.miss"] == 1
+    assert snapshot["counters"]["search_cache.hit"] == 1
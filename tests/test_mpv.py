@@ -0,0 +1,239 @@
+import json
+import asyncio
+import time
+import socket
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from ibuki.backend.mpv_control import MPVControl
+from ibuki.backend.mpv_async import AsyncMPVControl
+
+# Unit tests for mpv_control.py, mpv is stood in for by one end of a socketpair
+
+
+def _connect(mpv: MPVControl):
+    ours, theirs = socket.socketpair()
+    ours.settimeout(0.5)
+    mpv.socket = ours
+    mpv.running = True
+    threading.Thread(target=mpv._listen_ipc, daemon=True).start()
+    return theirs
+
+def _emit(sock, **msg):
+    sock.sendall(json.dumps(msg).encode() + b"\n")
+
+def _wait_for(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_property_changes_update_state():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock")
+    peer = _connect(mpv)
+
+    _emit(peer, event="property-change", id=1, name="time-pos", data=12.5)
+    _emit(peer, event="property-change", id=2, name="duration", data=1440.0)
+    _emit(peer, event="property-change", id=3, name="pause", data=True)
+
+    assert _wait_for(lambda: mpv.state["pause"] is True)
+    assert mpv.get_current_state() == (12.5, 1440.0)
+    assert mpv.get_elapsed_time() == 12
+    assert mpv.current_duration == 1440.0
+    mpv.running = False
+
+def test_unloaded_position_keeps_last_value():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock")
+    exited = threading.Event()
+    mpv.on_exit = exited.set
+    peer = _connect(mpv)
+
+    _emit(peer, event="property-change", id=1, name="time-pos", data=300.0)
+    _emit(peer, event="property-change", id=1, name="time-pos")
+    _emit(peer, event="end-file", reason="quit")
+
+    assert exited.wait(1.0)
+    assert mpv.get_elapsed_time() == 300
+
+def _replies(peer, answer):
+    """Answer every command read from peer with answer(command)."""
+    def _serve():
+        buffer = b""
+        while True:
+            try:
+                data = peer.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                msg = json.loads(line)
+                reply = answer(msg["command"])
+                if reply is not None:
+                    reply["request_id"] = msg["request_id"]
+                    peer.sendall(json.dumps(reply).encode() + b"\n")
+    threading.Thread(target=_serve, daemon=True).start()
+
+def test_concurrent_commands_get_their_own_replies():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock")
+    peer = _connect(mpv)
+    _replies(peer, lambda cmd: {"error": "success", "data": cmd[1]})
+
+    futures = mpv.command_batch([["get_property", name] for name in ("a", "b", "c")])
+    assert [f.result(timeout=1) for f in futures] == ["a", "b", "c"]
+    assert mpv.request("get_property", "volume") == "volume"
+    mpv.running = False
+
+def test_command_error_and_timeout():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock")
+    peer = _connect(mpv)
+    _replies(peer, lambda cmd: None if cmd[1] == "slow" else {"error": "property unavailable"})
+
+    assert mpv.request("get_property", "missing") is None
+    future = mpv.command("get_property", "slow", timeout=0.1)
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2)
+    assert not mpv._pending
+    mpv.running = False
+
+"""
+AsyncMPVControl Tests
+"""
+def test_async_controller_commands_and_events(tmp_path):
+    sock_path = str(tmp_path / "mpv.sock")
+
+    async def serve(reader, writer):
+        while line := await reader.readline():
+            msg = json.loads(line)
+            if msg["command"][0] == "observe_property":
+                reply = {"error": "success"}
+            else:
+                reply = {"error": "success", "data": msg["command"][1]}
+            reply["request_id"] = msg["request_id"]
+            writer.write(json.dumps(reply).encode() + b"\n")
+            if msg["command"][0] == "get_property" and msg["command"][1] == "done":
+                writer.write(b'{"event":"property-change","id":1,"name":"time-pos","data":42.0}\n')
+                writer.write(b'{"event":"end-file","reason":"eof"}\n')
+            await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_unix_server(serve, path=sock_path)
+        mpv = AsyncMPVControl(sock_path=sock_path)
+        assert await mpv.connect(timeout=1.0)
+
+        results = await mpv.command_batch([["get_property", "a"], ["get_property", "b"]])
+        assert results == ["a", "b"]
+        assert await mpv.command("get_property", "done") == "done"
+
+        events = [event async for event in _until_end(mpv)]
+        assert events[-1]["event"] == "end-file"
+        assert mpv.get_elapsed_time() == 42
+
+        await mpv.close()
+        server.close()
+
+    asyncio.run(scenario())
+
+async def _until_end(mpv):
+    async for event in mpv.events():
+        yield event
+        if event.get("event") == "end-file":
+            return
+
+def test_launch_connects_fast_and_records_timings(tmp_path, monkeypatch):
+    sock_path = str(tmp_path / "mpv.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def fake_popen(cmd, **kwargs):
+        def _bind_later():
+            time.sleep(0.05)
+            server.bind(sock_path)
+            server.listen(1)
+            conn, _ = server.accept()
+            conn.sendall(b'{"event":"playback-restart"}\n')
+            time.sleep(0.5)
+        threading.Thread(target=_bind_later, daemon=True).start()
+        proc = MagicMock()
+        proc.poll.return_value = None
+        return proc
+
+    monkeypatch.setattr("ibuki.backend.mpv_control.subprocess.Popen", fake_popen)
+    mpv = MPVControl(sock_path=sock_path)
+    assert mpv.launch("http://example.com") is True
+    assert mpv.timings["launch_to_connected"] < 0.4
+    assert _wait_for(lambda: mpv.timings["launch_to_first_frame"] is not None)
+    mpv.running = False
+
+def test_launch_gives_up_when_mpv_dies(tmp_path, monkeypatch):
+    proc = MagicMock()
+    proc.poll.return_value = 1
+    proc.returncode = 1
+    proc.communicate.return_value = (b"", b"bad url")
+    monkeypatch.setattr("ibuki.backend.mpv_control.subprocess.Popen", lambda *a, **k: proc)
+
+    mpv = MPVControl(sock_path=str(tmp_path / "mpv.sock"))
+    started = time.monotonic()
+    assert mpv.launch("http://example.com") is False
+    assert time.monotonic() - started < 0.2
+    assert mpv.running is False
+
+def test_persistent_player_tells_episode_end_from_exit():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock", persistent=True)
+    ended, exited = [], threading.Event()
+    mpv.on_end_file = ended.append
+    mpv.on_exit = exited.set
+    peer = _connect(mpv)
+
+    _emit(peer, event="end-file", reason="stop")
+    _emit(peer, event="end-file", reason="eof")
+    assert _wait_for(lambda: ended == ["eof"])
+    assert mpv.running is True
+    assert not exited.is_set()
+
+    _emit(peer, event="end-file", reason="quit")
+    assert exited.wait(1.0)
+
+def test_load_sends_options_and_loadfile_in_one_write():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock", persistent=True)
+    peer = _connect(mpv)
+    mpv.load("http://example.com/ep2.m3u8", start_time=90, options={"referrer": "https://allanime.day"})
+
+    peer.settimeout(1.0)
+    commands = [json.loads(line)["command"] for line in peer.recv(4096).decode().splitlines()]
+    assert commands == [
+        ["set_property", "start", "90"],
+        ["set_property", "referrer", "https://allanime.day"],
+        ["loadfile", "http://example.com/ep2.m3u8", "replace"],
+    ]
+    mpv.running = False
+
+def test_on_exit_relaunch_leaves_one_listener():
+    mpv = MPVControl(sock_path="/tmp/ibuki-test-unused.sock")
+    first = _connect(mpv)
+    relaunched = threading.Event()
+    listeners = []
+    peers = []
+
+    def on_exit():
+        # What play_episode -> launch() does for auto-next
+        listeners.append(threading.current_thread())
+        mpv.on_exit = None
+        peers.append(_connect(mpv))
+        relaunched.set()
+
+    mpv.on_exit = on_exit
+    _emit(first, event="end-file", reason="eof")
+    assert relaunched.wait(1.0)
+
+    assert _wait_for(lambda: not listeners[0].is_alive())
+    alive = [t for t in threading.enumerate() if getattr(t, "_target", None) == mpv._listen_ipc]
+    assert len(alive) == 1
+    assert mpv.running and mpv.socket is not None
+    mpv.running = False
@@ -0,0 +1,160 @@
+import time
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from ibuki.backend.utils_v3 import WatchHistory
+
+# Tests for AnimeBackend's playback flow: auto-next, prefetching and stream resolution
+
+
+@pytest.fixture
+def backend(backend):
+    """The shared tmp_path backend with a mocked player and auto-next on."""
+    backend.player = MagicMock()
+    backend.auto_next_episode = True
+    backend.prefetch_next_at = 0.8
+    return backend
+
+def _anime():
+    anime = MagicMock()
+    anime.identifier = "anime1"
+    anime.name = "Test Anime"
+    return anime
+
+def test_prefetch_starts_past_threshold(backend):
+    anime = _anime()
+    backend.current_anime, backend.current_episode = anime, 1
+    backend.get_episodes = MagicMock(return_value=[1, 2, 3])
+    anime.get_video.return_value = MagicMock(url="http://example.com/ep2")
+
+    backend._on_progress_tick(500, 1000)
+    time.sleep(0.05)
+    anime.get_video.assert_not_called()
+
+    backend._on_progress_tick(900, 1000)
+    deadline = time.monotonic() + 1
+    while ("anime1", 2, backend.global_quality, "sub") not in backend.stream_cache and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    next_ep, stream = backend._resolve_next_episode(anime, 1)
+    assert next_ep == 2
+    assert stream.url == "http://example.com/ep2"
+    anime.get_video.assert_called_once()
+
+def test_stream_cache_shared_by_resume(backend):
+    anime = _anime()
+    anime.get_video.return_value = MagicMock(url="http://example.com/ep4")
+    backend.cache["anime1"] = anime
+    backend.watch_history.update_progress("anime1", "Test Anime", 4, 50, 100)
+
+    backend.get_episode_stream(anime, 4, backend.global_quality)
+    assert backend.resume_anime("anime1") is True
+    anime.get_video.assert_called_once()
+
+def test_load_failure_drops_cached_stream(backend):
+    anime = _anime()
+    anime.get_video.return_value = MagicMock(url="http://example.com/broken")
+    backend.get_episode_stream(anime, 1, 1080)
+
+    backend.current_anime, backend.current_episode = anime, 1
+    backend.current_url = "http://example.com/broken"
+    backend._on_episode_end("error")
+
+    backend.get_episode_stream(anime, 1, 1080)
+    assert anime.get_video.call_count == 2
+
+def test_resume_rebuilds_anime_from_index_without_search(backend):
+    from anipy_api.anime import Anime
+    from anipy_api.provider import LanguageTypeEnum
+
+    backend.provider = MagicMock(NAME="allanime")
+    backend.anime_index.add(Anime(backend.provider, "Test Anime", "anime1", {LanguageTypeEnum.SUB}))
+    backend.watch_history.update_progress("anime1", "Test Anime", 2, 50, 100)
+    backend.get_anime_by_query = MagicMock()
+    backend.provider.get_video.return_value = [MagicMock(url="http://example.com/ep2", resolution=1080, subtitle=None)]
+
+    assert backend.resume_anime("anime1") is True
+    backend.get_anime_by_query.assert_not_called()
+    assert backend.current_anime.name == "Test Anime"
+    assert backend.current_anime.languages == {LanguageTypeEnum.SUB}
+
+def test_quit_after_loading_next_episode_saves_that_episode(backend):
+    anime = _anime()
+    backend.player.persistent = True
+    backend.player.is_alive.return_value = True
+    backend.player.last_end_reason = "error"
+    backend.player.current_duration = 1440
+    backend.player.get_elapsed_time.return_value = 30
+
+    backend.play_episode(anime, 1, MagicMock(url="http://example.com/ep1", referrer="r"))
+    backend.play_episode(anime, 2, MagicMock(url="http://example.com/ep2", referrer="r"))
+    backend.player.launch.assert_called_once()
+    backend.player.load.assert_called_once()
+
+    backend.stream_cache.invalidate_url = MagicMock()
+    backend.player.get_elapsed_time.return_value = 600
+    backend.player.on_exit()
+
+    entry = backend.watch_history.get_entry("anime1")
+    assert (entry["episode"], entry["timestamp"]) == (2, 600)
+    backend.stream_cache.invalidate_url.assert_called_once_with("http://example.com/ep2")
+
+def test_closing_non_persistent_player_does_not_auto_next(backend):
+    anime = _anime()
+    backend.player.persistent = False
+    backend.player.get_elapsed_time.return_value = 1400
+    backend.player.current_duration = 1440
+    backend.current_anime, backend.current_episode = anime, 1
+    backend._resolve_next_episode = MagicMock(return_value=(2, MagicMock(url="http://example.com/ep2")))
+    backend.play_episode = MagicMock()
+
+    backend.player.last_end_reason = "quit"
+    backend._on_mpv_exit()
+    backend.play_episode.assert_not_called()
+
+    backend.player.last_end_reason = "eof"
+    backend._on_mpv_exit()
+    backend.play_episode.assert_called_once()
+
+class _AsyncPlayer:
+    """Just enough of AsyncMPVControl for _play_async, ending with one end-file."""
+
+    def __init__(self, reason):
+        self.reason = reason
+        self.current_duration = 1440
+
+    async def launch(self, url, start_time=0, extra_args=None):
+        return True
+
+    async def track_progress(self, callback, interval=10):
+        await asyncio.sleep(3600)
+
+    async def events(self):
+        yield {"event": "end-file", "reason": self.reason}
+
+    def get_elapsed_time(self):
+        return 1400
+
+    async def close(self):
+        pass
+
+def test_async_player_only_auto_nexts_on_eof(backend):
+    anime = _anime()
+    backend._resolve_next_episode = MagicMock(return_value=None)
+
+    for reason in ("quit", "eof"):
+        backend.player = _AsyncPlayer(reason)
+        asyncio.run(backend._play_async(anime, 1, "http://example.com/ep1", 0, []))
+
+    backend._resolve_next_episode.assert_called_once_with(anime, 1)
+
+def test_final_save_reaches_the_journal(backend, tmp_path):
+    backend.player.get_elapsed_time.return_value = 600
+    backend.player.current_duration = 1440
+    backend.watch_history.update_progress("anime1", "Test Anime", 1, 30, 1440)
+
+    backend._save_final_progress(_anime(), 1)
+    replayed = WatchHistory(file_path=tmp_path / "progress.json").history
+    assert replayed["anime1"]["timestamp"] == 600
@@ -0,0 +1,135 @@
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ibuki.backend.provider_control import ProviderAdapter, RetryBudget, get_shared_session
+
+# Tests for provider_control.py against a local stub server standing in for AllAnime
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    failures_left = 0
+    hits = 0
+
+    def do_GET(self):
+        StubHandler.hits += 1
+        if StubHandler.failures_left > 0:
+            StubHandler.failures_left -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        body = json.dumps([{"identifier": "abc", "name": "Stub Anime"}]).encode()
+        self.send_response(200 if self.path != "/missing" else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StubProvider:
+    NAME = "stub"
+
+    def __init__(self, base_url):
+        self.BASE_URL = base_url
+        self.session = requests.Session()
+
+    def get_search(self, query):
+        response = self.session.get(f"{self.BASE_URL}/{query}", timeout=2)
+        response.raise_for_status()
+        return response.json()
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+    StubHandler.failures_left = 0
+    StubHandler.hits = 0
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_adapter_shares_one_session(stub_server):
+    a = ProviderAdapter(StubProvider(stub_server))
+    b = ProviderAdapter(StubProvider(stub_server))
+    assert a.provider.session is b.provider.session is get_shared_session()
+    assert a.NAME == "stub"
+
+def test_anipy_session_reset_keeps_shared_pool(stub_server):
+    from anipy_api.provider.providers.allanime_provider import AllAnimeProvider
+
+    stub = ProviderAdapter(StubProvider(stub_server))
+    anipy = ProviderAdapter(AllAnimeProvider())
+    shared = anipy.provider.session
+    stub.get_search("frieren")
+    pools = shared.get_adapter(stub_server).poolmanager.pools
+    pooled = len(pools)
+    assert pooled >= 1
+
+    # What BaseProvider._request_page does after a ConnectionError
+    anipy.provider._generate_new_session()
+    assert anipy.provider.session is not shared
+    assert len(pools) == pooled
+
+    anipy._attach_session()
+    assert anipy.provider.session is shared
+
+def test_adapter_retries_transient_errors(stub_server):
+    StubHandler.failures_left = 2
+    adapter = ProviderAdapter(StubProvider(stub_server), max_retries=3, backoff_base=0.01)
+    assert adapter.get_search("frieren")[0]["name"] == "Stub Anime"
+    assert StubHandler.hits == 3
+
+def test_adapter_does_not_retry_client_errors(stub_server):
+    adapter = ProviderAdapter(StubProvider(stub_server), max_retries=3, backoff_base=0.01)
+    with pytest.raises(requests.HTTPError):
+        adapter.get_search("missing")
+    assert StubHandler.hits == 1
+
+def test_retry_budget_caps_retries(stub_server):
+    StubHandler.failures_left = 100
+    budget = RetryBudget(ratio=0.1, max_tokens=2)
+    adapter = ProviderAdapter(StubProvider(stub_server), max_retries=5, backoff_base=0.001, budget=budget)
+    with pytest.raises(requests.HTTPError):
+        adapter.get_search("frieren")
+    assert StubHandler.hits == 3
+
+class SlowProvider:
+    NAME = "slow"
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get_video(self, identifier, episode, lang):
+        with self.lock:
+            delay = self.delays[min(self.calls, len(self.delays) - 1)]
+            self.calls += 1
+        time.sleep(delay)
+        return f"stream-{delay}"
+
+def test_hedge_waits_for_enough_samples():
+    adapter = ProviderAdapter(SlowProvider([0.01]), hedge=True, hedge_min_samples=5)
+    assert adapter.hedge_threshold("get_video") is None
+    for _ in range(5):
+        adapter.get_video("abc", 1, "sub")
+    assert adapter.hedge_threshold("get_video") == adapter.hedge_floor
+    assert adapter.hedges_fired == 0
+
+def test_hedge_fires_second_request_when_slow():
+    provider = SlowProvider([0.01] * 5 + [1.0, 0.01])
+    adapter = ProviderAdapter(provider, hedge=True, hedge_min_samples=5, hedge_floor=0.05)
+    for _ in range(5):
+        adapter.get_video("abc", 1, "sub")
+
+    started = time.monotonic()
+    assert adapter.get_video("abc", 1, "sub") == "stream-0.01"
+    assert time.monotonic() - started < 0.5
+    assert adapter.hedges_fired == 1
+    assert provider.calls == 7
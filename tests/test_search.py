@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+from textual.app import App
+from textual.widgets import ListView
+
+from ibuki.backend.title_control import TitleIndex
+from ibuki.screens.search import SearchScreen
+from ibuki.screens.anime_detail import AnimeDetailScreen
+
+from .fakes import FakeAllAnimeProvider
+
+# Tests for local title matches and search-as-you-type in SearchScreen
+
+
+def test_search_local_uses_index_and_history(backend, make_backend):
+    backend.get_anime_by_query("fake anime 1")
+    backend.watch_history.update_progress("other1", "Other Anime 1", 3, 50, 100)
+
+    fresh = make_backend()
+    fresh.anime_index = backend.anime_index
+    fresh.watch_history = backend.watch_history
+    assert "other1" in fresh.title_index
+
+    names = [anime.name for anime in fresh.search_local("fake anmie 1")]
+    assert names[0] == "Fake Anime 1"
+    # Only in history, never indexed, so there is nothing to rebuild it from
+    assert "Other Anime 1" not in names
+    assert fresh.provider.calls == {}
+
+def test_search_local_matches_partial_words(backend):
+    backend.get_anime_by_query("fake anime")
+    names = [anime.name for anime in backend.search_local("fake anime 1", limit=3)]
+    assert names == ["Fake Anime 1", "Fake Anime 10", "Fake Anime 11"]
+    assert [anime.name for anime in backend.search_local("fak")][:1] == ["Fake Anime 0"]
+
+def test_suggest_titles_for_typos(backend):
+    backend.title_index = TitleIndex()
+    backend.title_index.add_many([("fr", "Sousou no Frieren"), ("op", "One Piece")])
+    assert backend.suggest_titles("frieern") == ["Sousou no Frieren"]
+    assert backend.suggest_titles("zzzz") == []
+
+def test_find_anime_by_name_prefers_closest_title(backend):
+    backend.provider.catalog = {"a": "Frieren Recap Special", "b": "Sousou no Frieren", "c": "Unrelated"}
+    assert backend.find_anime_by_name("Frieren").identifier == "b"
+    assert backend.find_anime_by_name("Frieren", identifier="a").identifier == "a"
+    assert backend.find_anime_by_name("Unrelated Show Title") is None
+
+def test_typing_debounces_and_merges(backend):
+    backend.provider = FakeAllAnimeProvider(latency=0.2)
+    backend.title_index = TitleIndex()
+    backend.title_index.add("fake3", "Fake Anime 3")
+    backend.cache["fake3"] = MagicMock(identifier="fake3")
+    backend.cache["fake3"].name = "Fake Anime 3"
+
+    async def run():
+        app = App()
+        async with app.run_test() as pilot:
+            screen = SearchScreen(backend)
+            await app.push_screen(screen)
+            await pilot.press(*"anime 3")
+            await pilot.pause()
+
+            results = screen.query_one("#search_results", ListView)
+            local = [getattr(child, "anime", None) for child in results.children]
+            assert [a.name for a in local if a] == ["Fake Anime 3"]
+
+            deadline = time.monotonic() + 3
+            while len(results.children) < 2 and time.monotonic() < deadline:
+                await pilot.pause(0.05)
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            names = [child.anime.name for child in results.children if getattr(child, "anime", None)]
+            return names
+
+    names = asyncio.run(run())
+    assert backend.provider.calls["get_search"] == 1
+    assert names[0] == "Fake Anime 3"
+    assert names.count("Fake Anime 3") == 1
+
+def test_local_lookup_stays_off_the_event_loop(backend):
+    threads = []
+    search_local = backend.search_local
+
+    def slow_search_local(query, limit=10):
+        threads.append(threading.current_thread())
+        time.sleep(0.2)
+        return search_local(query, limit)
+
+    backend.search_local = slow_search_local
+
+    async def run():
+        app = App()
+        async with app.run_test() as pilot:
+            screen = SearchScreen(backend)
+            await app.push_screen(screen)
+            started = time.perf_counter()
+            await pilot.press(*"fake")
+            typed_in = time.perf_counter() - started
+            await app.workers.wait_for_complete()
+            return typed_in
+
+    assert asyncio.run(run()) < 0.4
+    assert threads and threading.main_thread() not in threads
+
+def test_no_results_offers_suggestions(backend):
+    backend.title_index = TitleIndex()
+    backend.title_index.add("fake3", "Fake Anime 3")
+
+    async def run():
+        app = App()
+        async with app.run_test() as pilot:
+            screen = SearchScreen(backend)
+            await app.push_screen(screen)
+            await pilot.press(*"fakr anmie 3x", "enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            results = screen.query_one("#search_results", ListView)
+            return [getattr(child, "suggestion", None) for child in results.children]
+
+    assert asyncio.run(run()) == [None, "Fake Anime 3"]
+
+def test_details_after_search_need_no_fetch(backend):
+
+    async def run():
+        app = App()
+        async with app.run_test() as pilot:
+            screen = SearchScreen(backend)
+            await app.push_screen(screen)
+            await pilot.press(*"fake anime 2", "enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+            results = screen.query_one("#search_results", ListView)
+            results.index = 0
+            calls = backend.provider.calls.get("get_info", 0)
+            screen.action_synopsis()
+            await pilot.pause()
+            assert isinstance(app.screen, AnimeDetailScreen)
+            assert app.screen.info is not None
+            return calls, app.screen.info
+
+    calls, info = asyncio.run(run())
+    assert backend.provider.calls["get_info"] == calls
+    assert info.synopsis == "Synopsis of fake2"
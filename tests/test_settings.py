@@ -0,0 +1,72 @@
+import os
+import time
+from unittest.mock import patch
+
+import yaml
+
+from ibuki.backend.settings_control import AnimeSettings
+
+# Tests for batched saves, mtime reloads and subscribers in AnimeSettings
+
+
+def _settings(tmp_path):
+    return AnimeSettings(config_path=tmp_path / "settings.yaml")
+
+def test_batch_writes_once_and_notifies_once(tmp_path):
+    settings = _settings(tmp_path)
+    seen = []
+    settings.subscribe(seen.append)
+
+    with patch("ibuki.backend.settings_control.os.replace", wraps=os.replace) as replace:
+        with settings.batch():
+            settings.set("quality", 720)
+            settings.set("fullscreen", False)
+            with settings.batch():
+                settings.reset_key("fullscreen")
+            settings.set("skip_intro_seconds", 85)
+
+    assert replace.call_count == 1
+    assert seen == [{"quality": 720, "fullscreen": True, "skip_intro_seconds": 85}]
+    on_disk = yaml.safe_load((tmp_path / "settings.yaml").read_text())
+    assert on_disk["quality"] == 720 and on_disk["skip_intro_seconds"] == 85
+    assert list(tmp_path.iterdir()) == [tmp_path / "settings.yaml"]
+
+def test_unchanged_values_are_not_pushed(tmp_path):
+    settings = _settings(tmp_path)
+    seen = []
+    settings.subscribe(seen.append)
+    settings.set("quality", settings.get("quality"))
+    settings.update_multiple({"quality": 480, "fullscreen": True})
+    assert seen == [{"quality": 480}]
+
+def test_reload_only_when_mtime_changes(tmp_path):
+    settings = _settings(tmp_path)
+    seen = []
+    settings.subscribe(seen.append)
+    assert settings.reload_if_changed() is False
+
+    path = tmp_path / "settings.yaml"
+    data = yaml.safe_load(path.read_text())
+    data["quality"] = 480
+    del data["history_limit"]
+    path.write_text(yaml.safe_dump(data))
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    settings.settings["history_limit"] = 5
+
+    assert settings.reload_if_changed() is True
+    assert settings.get("quality") == 480
+    assert settings.get("history_limit") == AnimeSettings.DEFAULT_SETTINGS["history_limit"]
+    assert seen == [{"quality": 480, "history_limit": AnimeSettings.DEFAULT_SETTINGS["history_limit"]}]
+    assert settings.reload_if_changed() is False
+
+def test_backend_follows_settings(backend):
+    settings = backend.settings
+    with settings.batch():
+        settings.set("quality", 720)
+        settings.set("skip_intro_seconds", 90)
+    assert backend.global_quality == 720
+    assert backend.skip_intro_seconds == 90
+
+    settings.reset()
+    assert backend.global_quality == AnimeSettings.DEFAULT_SETTINGS["quality"]
+    assert backend.skip_intro_seconds == 0
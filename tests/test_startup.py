@@ -0,0 +1,42 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Cold-start budget for the ibuki entry point, measured with python -X importtime.
+# Budget: importing ibuki.__main__ in a fresh interpreter stays under 750ms
+# (it is ~300ms, almost all of it Textual), and never pulls in anipy_api,
+# requests or the backend, those load after the home screen is up.
+
+pytestmark = pytest.mark.benchmark
+
+IMPORT_BUDGET = 0.75
+DEFERRED_MODULES = ("anipy_api", "requests", "ibuki.backend.backend_v3", "ibuki.screens.search")
+
+
+def _importtime(module):
+    """{module: cumulative seconds} for a fresh `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(\S+)", line)
+        if match:
+            times[match.group(2)] = int(match.group(1)) / 1e6
+    return times
+
+
+def test_entry_point_import_budget(record_latency):
+    best = None
+    for _ in range(3):
+        times = _importtime("ibuki.__main__")
+        best = min(best, times["ibuki.__main__"]) if best else times["ibuki.__main__"]
+        record_latency("import ibuki.__main__", times["ibuki.__main__"])
+
+    assert best < IMPORT_BUDGET, f"cold import {best * 1000:.0f}ms over {IMPORT_BUDGET * 1000:.0f}ms budget"
+    for module in DEFERRED_MODULES:
+        assert not any(name == module or name.startswith(module + ".") for name in times), \
+            f"{module} is imported at startup"
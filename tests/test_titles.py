@@ -0,0 +1,45 @@
+import random
+import string
+import time
+
+from ibuki.backend.title_control import TitleIndex, title_similarity, normalize_title
+
+# Unit tests for title_control.py
+
+
+def test_normalize_and_similarity():
+    assert normalize_title("  Re:Zero -Starting Life-  ") == "re zero starting life"
+    assert title_similarity("frieern", "Sousou no Frieren") > 0.8
+    assert title_similarity("one piece", "One Piece") == 1.0
+    assert title_similarity("", "One Piece") == 0.0
+
+def test_index_ranks_and_replaces_titles():
+    index = TitleIndex()
+    index.add_many([("1", "Sousou no Frieren"), ("2", "Frieren Recap"), ("3", "Naruto")])
+    assert [key for key, _, _ in index.search("sousou no frierne")][:1] == ["1"]
+    assert index.search("naruto")[0][0] == "3"
+
+    index.add("3", "Boruto")
+    assert index.get("3") == "Boruto"
+    assert all(key != "3" for key, _, _ in index.search("naruto", min_score=0.9))
+
+def test_match_finds_partial_words():
+    index = TitleIndex()
+    index.add_many([("fr", "Sousou no Frieren"), ("op", "One Piece"), ("opf", "One Piece Film: Red")])
+    assert index.match("fri") == [("fr", "Sousou no Frieren")]
+    assert index.match("frie") == [("fr", "Sousou no Frieren")]
+    assert [key for key, _ in index.match("one p")] == ["op", "opf"]
+    assert index.match("zzz") == []
+    assert index.search("fri", min_score=0.75) == []
+
+def test_search_stays_fast_on_large_index():
+    rng = random.Random(0)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(2000)]
+    index = TitleIndex()
+    index.add_many((str(i), " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))) for i in range(20000))
+    index.add("target", "Sousou no Frieren")
+
+    started = time.perf_counter()
+    results = index.search("sousou no frieern")
+    assert time.perf_counter() - started < 0.1
+    assert results[0][0] == "target"